@@ -1,4 +1,4 @@
-"""CLI: generate datasets, run blocking or reactive pipeline."""
+"""CLI: generate datasets, run blocking, reactive, reactive-batched or parallel pipeline."""
 
 from __future__ import annotations
 
@@ -9,6 +9,7 @@ from pathlib import Path
 
 from pipeline.blocking_runner import run as run_blocking
 from pipeline.config import Settings
+from pipeline.parallel_runner import run as run_parallel
 from pipeline.reactive_runner import run_sync as run_reactive_sync
 
 
@@ -31,10 +32,24 @@ def main() -> int:
 
     rb = sub.add_parser("run-blocking", help="Sequential pipeline")
     rb.add_argument("--dataset", type=Path, required=True)
+    rb.add_argument(
+        "--commit",
+        choices=("row", "batch", "copy"),
+        default=None,
+        help="Commit policy (default: BLOCKING_COMMIT, else row)",
+    )
 
     rr = sub.add_parser("run-reactive", help="Bounded queue + async workers")
     rr.add_argument("--dataset", type=Path, required=True)
 
+    rrb = sub.add_parser("run-reactive-batched", help="Bounded queue + async workers + batched COPY persist")
+    rrb.add_argument("--dataset", type=Path, required=True)
+
+    rp = sub.add_parser("run-parallel", help="Byte-range shards across worker processes, batched commits")
+    rp.add_argument("--dataset", type=Path, required=True)
+    rp.add_argument("--workers", type=int, default=None, help="Worker processes (default: PARALLEL_WORKERS, else CPU count)")
+    rp.add_argument("--commit", choices=("row", "batch", "copy"), default="copy", help="Commit policy per worker")
+
     args = parser.parse_args()
 
     if args.cmd == "generate":
@@ -47,7 +62,7 @@ def main() -> int:
     if args.cmd == "run-blocking":
         settings = Settings.from_env()
         try:
-            run_blocking(args.dataset, settings)
+            run_blocking(args.dataset, settings, commit=args.commit)
         finally:
             _shutdown_tracing()
         return 0
@@ -60,6 +75,19 @@ def main() -> int:
             _shutdown_tracing()
         return 0
 
+    if args.cmd == "run-reactive-batched":
+        settings = Settings.from_env()
+        try:
+            run_reactive_sync(args.dataset, settings, batched=True)
+        finally:
+            _shutdown_tracing()
+        return 0
+
+    if args.cmd == "run-parallel":
+        settings = Settings.from_env()
+        run_parallel(args.dataset, settings, workers=args.workers, commit=args.commit)
+        return 0
+
     return 1
 
 
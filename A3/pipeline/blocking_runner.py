@@ -1,16 +1,18 @@
-"""Strictly sequential pipeline: one event fully processed before the next."""
+"""Strictly sequential pipeline: one event fully processed before the next (commits per row or per batch)."""
 
 from __future__ import annotations
 
 import csv
 import json
+import logging
 import os
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 import psutil
 import psycopg
+from opentelemetry import trace
 
 from pipeline.config import Settings
 from pipeline import db
@@ -20,6 +22,10 @@ from pipeline import stages
 
 MODE = "blocking"
 
+# row: INSERT + COMMIT per event; batch: multi-row INSERT, COMMIT every N rows or T ms;
+# copy: COPY ... FROM STDIN per batch, same N/T bounds (PERSIST_BATCH_SIZE / PERSIST_BATCH_WAIT_MS)
+COMMIT_POLICIES = ("row", "batch", "copy")
+
 
 def _payload(ne: stages.NormalizedEvent) -> dict[str, Any]:
     return {
@@ -34,114 +40,236 @@ def _payload(ne: stages.NormalizedEvent) -> dict[str, Any]:
     }
 
 
-def run(dataset_path: Path, settings: Settings | None = None) -> dict[str, Any]:
-    settings = settings or Settings.from_env()
-    log = observability.setup_logging(settings.log_level)
-    tracer = observability.setup_tracing(
-        "a3-pipeline-blocking",
-        settings.otel_endpoint,
-        settings.trace_sample_ratio,
-    )
+def _record(ne: stages.NormalizedEvent, score: float, alert: bool) -> tuple[Any, ...]:
+    """Row in db.PROCESSED_COLUMNS order."""
+    return (ne.event_id, ne.sensor_id, ne.event_type, json.dumps(_payload(ne)), score, alert)
 
-    summary_path = os.getenv("BENCHMARK_SUMMARY", "results/benchmark_summary.json")
-    csv_path = os.getenv("BENCHMARK_CSV", "results/benchmark.csv")
 
+def process_lines(
+    conn,
+    lines: Iterable[tuple[Any, str]],
+    settings: Settings,
+    *,
+    commit: str,
+    mode: str,
+    log: logging.Logger,
+    tracer: trace.Tracer,
+) -> dict[str, int]:
+    """
+    Run every stage for (line_ref, line) pairs in order on one psycopg connection.
+    line_ref only labels events without an event_id in logs. Returns processed, errors,
+    alerts and peak_rss (bytes) for this process.
+    """
     proc = psutil.Process()
     peak_rss = proc.memory_info().rss
     errors = 0
     processed = 0
     alerts = 0
-    t0 = time.perf_counter()
+    seen = 0
+    # Analyzed events not yet committed; counted as processed/alerts only once stored
+    pending: list[tuple[stages.NormalizedEvent, float, bool]] = []
+    pending_since = 0.0
 
-    with psycopg.connect(settings.dsn_sync, autocommit=False) as conn:
-        db.init_schema_sync(conn)
+    def persist_one_by_one(conn, batch) -> list[bool]:
+        """Fallback after a failed batch: one committed INSERT per row, so only bad rows count as errors."""
+        written = []
+        for ne, score, alert in batch:
+            try:
+                db.insert_processed_sync(
+                    conn,
+                    event_id=ne.event_id,
+                    sensor_id=ne.sensor_id,
+                    event_type=ne.event_type,
+                    payload=_payload(ne),
+                    anomaly_score=score,
+                    alert_raised=alert,
+                )
+                written.append(True)
+            except Exception as e:
+                conn.rollback()
+                observability.metrics_inc_db_error(mode)
+                observability.log_extra(
+                    log,
+                    "db_error",
+                    mode=mode,
+                    correlation_id=ne.event_id,
+                    stage="persist",
+                    error=str(e),
+                )
+                written.append(False)
+        return written
 
-        with open(dataset_path, encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                if line_num % 2000 == 0:
-                    peak_rss = max(peak_rss, proc.memory_info().rss)
+    def flush(conn) -> None:
+        nonlocal errors, processed, alerts
+        batch = pending[:]
+        pending.clear()
+        sample = observability.should_sample(settings.trace_sample_ratio)
+        t_db = time.perf_counter()
+        try:
+            with observability.stage_span(
+                tracer, "persist", sample=sample, attributes={"mode": mode, "batch_size": len(batch)}
+            ):
+                records = [_record(*item) for item in batch]
+                if commit == "copy":
+                    db.copy_processed_sync(conn, records)
+                else:
+                    db.insert_processed_batch_sync(conn, records)
+                conn.commit()
+            written = [True] * len(batch)
+        except Exception as e:
+            # The whole transaction is gone; retry row by row to find the bad rows
+            conn.rollback()
+            observability.log_extra(
+                log,
+                "batch_persist_failed",
+                mode=mode,
+                stage="persist",
+                batch_size=len(batch),
+                error=str(e),
+            )
+            written = persist_one_by_one(conn, batch)
+        # One observation per batch: the histogram shows commit latency, not per-row latency
+        observability.metrics_observe_stage(mode, "persist", time.perf_counter() - t_db)
 
-                line = line.strip()
-                if not line:
+        with observability.stage_span(tracer, "alert", sample=sample, attributes={"mode": mode}):
+            for (_, _, alert), ok in zip(batch, written):
+                if not ok:
+                    errors += 1
                     continue
+                if alert:
+                    alerts += 1
+                    observability.metrics_inc_alert(mode)
+                processed += 1
+                observability.metrics_inc_processed(mode)
 
-                raw = json.loads(line)
-                sample = observability.should_sample(settings.trace_sample_ratio)
+    for line_ref, line in lines:
+        seen += 1
+        if seen % 2000 == 0:
+            peak_rss = max(peak_rss, proc.memory_info().rss)
 
-                t_validate = time.perf_counter()
-                with observability.stage_span(
-                    tracer, "validate", sample=sample, attributes={"mode": MODE}
-                ):
-                    ok, err = stages.validate(raw)
-                observability.metrics_observe_stage(MODE, "validate", time.perf_counter() - t_validate)
+        line = line.strip()
+        if not line:
+            continue
 
-                if not ok:
-                    errors += 1
-                    observability.metrics_inc_validation_error(MODE)
-                    observability.log_extra(
-                        log,
-                        "validation_failed",
-                        mode=MODE,
-                        correlation_id=raw.get("event_id", f"line_{line_num}"),
-                        stage="validate",
-                        error=err,
-                    )
-                    continue
+        raw = json.loads(line)
+        sample = observability.should_sample(settings.trace_sample_ratio)
 
-                t_norm = time.perf_counter()
-                with observability.stage_span(tracer, "normalize", sample=sample, attributes={"mode": MODE}):
-                    ne = stages.normalize(raw)
-                observability.metrics_observe_stage(MODE, "normalize", time.perf_counter() - t_norm)
-
-                t_an = time.perf_counter()
-                with observability.stage_span(tracer, "analyze", sample=sample, attributes={"mode": MODE}):
-                    score = stages.analyze(ne)
-                observability.metrics_observe_stage(MODE, "analyze", time.perf_counter() - t_an)
-
-                alert = stages.should_alert(score)
-                t_db = time.perf_counter()
-                try:
-                    with observability.stage_span(tracer, "persist", sample=sample, attributes={"mode": MODE}):
-                        db.insert_processed_sync(
-                            conn,
-                            event_id=ne.event_id,
-                            sensor_id=ne.sensor_id,
-                            event_type=ne.event_type,
-                            payload=_payload(ne),
-                            anomaly_score=score,
-                            alert_raised=alert,
-                        )
-                except Exception as e:
-                    errors += 1
-                    observability.metrics_inc_db_error(MODE)
-                    observability.log_extra(
-                        log,
-                        "db_error",
-                        mode=MODE,
-                        correlation_id=ne.event_id,
-                        stage="persist",
-                        error=str(e),
-                    )
-                    continue
-                observability.metrics_observe_stage(MODE, "persist", time.perf_counter() - t_db)
+        t_validate = time.perf_counter()
+        with observability.stage_span(
+            tracer, "validate", sample=sample, attributes={"mode": mode}
+        ):
+            ok, err = stages.validate(raw)
+        observability.metrics_observe_stage(mode, "validate", time.perf_counter() - t_validate)
 
-                with observability.stage_span(tracer, "alert", sample=sample, attributes={"mode": MODE}):
-                    if alert:
-                        alerts += 1
-                        observability.metrics_inc_alert(MODE)
+        if not ok:
+            errors += 1
+            observability.metrics_inc_validation_error(mode)
+            observability.log_extra(
+                log,
+                "validation_failed",
+                mode=mode,
+                correlation_id=raw.get("event_id", f"line_{line_ref}"),
+                stage="validate",
+                error=err,
+            )
+            continue
 
-                processed += 1
-                observability.metrics_inc_processed(MODE)
+        t_norm = time.perf_counter()
+        with observability.stage_span(tracer, "normalize", sample=sample, attributes={"mode": mode}):
+            ne = stages.normalize(raw)
+        observability.metrics_observe_stage(mode, "normalize", time.perf_counter() - t_norm)
+
+        t_an = time.perf_counter()
+        with observability.stage_span(tracer, "analyze", sample=sample, attributes={"mode": mode}):
+            score = stages.analyze(ne)
+        observability.metrics_observe_stage(mode, "analyze", time.perf_counter() - t_an)
+
+        alert = stages.should_alert(score)
+        if commit != "row":
+            if not pending:
+                pending_since = time.perf_counter()
+            pending.append((ne, score, alert))
+            if (
+                len(pending) >= settings.persist_batch_size
+                or (time.perf_counter() - pending_since) * 1000 >= settings.persist_batch_wait_ms
+            ):
+                flush(conn)
+            continue
+
+        t_db = time.perf_counter()
+        try:
+            with observability.stage_span(tracer, "persist", sample=sample, attributes={"mode": mode}):
+                db.insert_processed_sync(
+                    conn,
+                    event_id=ne.event_id,
+                    sensor_id=ne.sensor_id,
+                    event_type=ne.event_type,
+                    payload=_payload(ne),
+                    anomaly_score=score,
+                    alert_raised=alert,
+                )
+        except Exception as e:
+            conn.rollback()
+            errors += 1
+            observability.metrics_inc_db_error(mode)
+            observability.log_extra(
+                log,
+                "db_error",
+                mode=mode,
+                correlation_id=ne.event_id,
+                stage="persist",
+                error=str(e),
+            )
+            continue
+        observability.metrics_observe_stage(mode, "persist", time.perf_counter() - t_db)
+
+        with observability.stage_span(tracer, "alert", sample=sample, attributes={"mode": mode}):
+            if alert:
+                alerts += 1
+                observability.metrics_inc_alert(mode)
+
+        processed += 1
+        observability.metrics_inc_processed(mode)
+
+    if pending:
+        flush(conn)
 
-    duration = time.perf_counter() - t0
     peak_rss = max(peak_rss, proc.memory_info().rss)
-    peak_mb = peak_rss / (1024 * 1024)
+    return {"processed": processed, "errors": errors, "alerts": alerts, "peak_rss": peak_rss}
+
+
+def run(dataset_path: Path, settings: Settings | None = None, commit: str | None = None) -> dict[str, Any]:
+    settings = settings or Settings.from_env()
+    commit = commit or settings.blocking_commit
+    if commit not in COMMIT_POLICIES:
+        raise ValueError(f"commit policy must be one of {COMMIT_POLICIES}, got {commit!r}")
+    # Keep the historical label for per-row commits so existing result CSVs stay comparable
+    mode = MODE if commit == "row" else f"{MODE}-{commit}"
+    log = observability.setup_logging(settings.log_level, settings.log_queue_size, settings.log_queue_policy)
+    tracer = observability.setup_tracing(
+        f"a3-pipeline-{mode}",
+        settings.otel_endpoint,
+        settings.trace_sample_ratio,
+    )
+
+    summary_path = os.getenv("BENCHMARK_SUMMARY", "results/benchmark_summary.json")
+    csv_path = os.getenv("BENCHMARK_CSV", "results/benchmark.csv")
+
+    t0 = time.perf_counter()
+    with psycopg.connect(settings.dsn_sync, autocommit=False) as conn:
+        db.init_schema_sync(conn)
+        with open(dataset_path, encoding="utf-8") as f:
+            counts = process_lines(conn, enumerate(f, 1), settings, commit=commit, mode=mode, log=log, tracer=tracer)
+
+    duration = time.perf_counter() - t0
+    peak_mb = counts["peak_rss"] / (1024 * 1024)
+    processed, errors, alerts = counts["processed"], counts["errors"], counts["alerts"]
     eps = processed / duration if duration > 0 else 0.0
 
     dataset_label = dataset_path.stem
     row = {
         "dataset": dataset_label,
-        "mode": MODE,
+        "mode": mode,
         "event_count": processed,
         "duration_s": round(duration, 4),
         "events_per_s": round(eps, 2),
@@ -153,7 +281,7 @@ def run(dataset_path: Path, settings: Settings | None = None) -> dict[str, Any]:
     observability.log_extra(
         log,
         "run_complete",
-        mode=MODE,
+        mode=mode,
         alerts_raised=alerts,
         **{k: v for k, v in row.items() if k != "mode"},
     )
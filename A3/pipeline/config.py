@@ -16,6 +16,20 @@ class Settings:
     otel_endpoint: str | None
     trace_sample_ratio: float
     log_level: str
+    log_queue_size: int
+    log_queue_policy: str
+    persist_batch_size: int
+    persist_batch_wait_ms: int
+    persist_flushers: int
+    blocking_commit: str
+    parallel_workers: int
+
+    def __post_init__(self) -> None:
+        # Zero flushers would leave the batch queue undrained and hang the reactive-batched run
+        for name in ("persist_batch_size", "persist_flushers"):
+            value = getattr(self, name)
+            if value < 1:
+                raise ValueError(f"{name} must be >= 1, got {value}")
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -30,6 +44,13 @@ class Settings:
             otel_endpoint=(os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or "").strip() or None,
             trace_sample_ratio=float(os.getenv("OTEL_TRACES_SAMPLE_RATIO", "1.0")),
             log_level=os.getenv("LOG_LEVEL", "INFO"),
+            log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            log_queue_policy=os.getenv("LOG_QUEUE_POLICY", "block"),
+            persist_batch_size=int(os.getenv("PERSIST_BATCH_SIZE", "500")),
+            persist_batch_wait_ms=int(os.getenv("PERSIST_BATCH_WAIT_MS", "20")),
+            persist_flushers=int(os.getenv("PERSIST_FLUSHERS", "2")),
+            blocking_commit=os.getenv("BLOCKING_COMMIT", "row"),
+            parallel_workers=int(os.getenv("PARALLEL_WORKERS", "0")),
         )
 
     @property
@@ -7,6 +7,16 @@ from typing import Any
 
 import asyncpg
 
+# Column order of the tuples passed to the batch insert helpers
+PROCESSED_COLUMNS = (
+    "event_id",
+    "sensor_id",
+    "event_type",
+    "normalized_payload",
+    "anomaly_score",
+    "alert_raised",
+)
+
 SCHEMA_SQL = """
 CREATE TABLE IF NOT EXISTS processed_events (
     id BIGSERIAL PRIMARY KEY,
@@ -63,6 +73,30 @@ def insert_processed_sync(
     conn.commit()
 
 
+def insert_processed_batch_sync(conn, records: list[tuple[Any, ...]]) -> None:
+    """
+    Multi-row INSERT (pipelined by psycopg) inside the caller's open transaction; no commit.
+    Each record follows PROCESSED_COLUMNS, with the payload already serialized to JSON text.
+    """
+    with conn.cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO processed_events
+            (event_id, sensor_id, event_type, normalized_payload, anomaly_score, alert_raised)
+            VALUES (%s, %s, %s, %s::jsonb, %s, %s)
+            """,
+            records,
+        )
+
+
+def copy_processed_sync(conn, records: list[tuple[Any, ...]]) -> None:
+    """COPY ... FROM STDIN inside the caller's open transaction; no commit. Records as above."""
+    with conn.cursor() as cur:
+        with cur.copy(f"COPY processed_events ({', '.join(PROCESSED_COLUMNS)}) FROM STDIN") as copy:
+            for record in records:
+                copy.write_row(record)
+
+
 async def insert_processed_async(
     conn: asyncpg.Connection,
     *,
@@ -86,3 +120,11 @@ async def insert_processed_async(
         anomaly_score,
         alert_raised,
     )
+
+
+async def insert_processed_batch_async(conn: asyncpg.Connection, records: list[tuple[Any, ...]]) -> None:
+    """
+    COPY many rows in one round trip. Each record follows PROCESSED_COLUMNS, with the
+    payload already serialized to JSON text. All-or-nothing: one bad row fails the batch.
+    """
+    await conn.copy_records_to_table("processed_events", records=records, columns=PROCESSED_COLUMNS)
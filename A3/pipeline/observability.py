@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import queue
 import random
 import sys
+import threading
 import time
 from contextlib import contextmanager
 from typing import Any, Iterator
 
+import orjson
 from opentelemetry import trace
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.sdk.resources import Resource
@@ -47,6 +49,24 @@ _stage_seconds = Histogram(
 
 
 class JsonLogHandler(logging.Handler):
+    """JSON-lines handler: records are serialized on the calling thread, then a
+    background thread writes them to stdout in batches, flushing once per batch.
+
+    The queue is bounded; when it is full the caller either waits (``block=True``)
+    or the record is dropped and counted in ``dropped``. Lines that cannot be
+    written (closed or broken stdout) are counted there too, and the writer
+    keeps draining so ``flush()`` never hangs.
+    """
+
+    def __init__(self, queue_size: int = 10_000, batch_size: int = 256, block: bool = True) -> None:
+        super().__init__()
+        self._queue: queue.Queue[bytes | None] = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._block = block
+        self.dropped = 0
+        self._writer = threading.Thread(target=self._drain, name="a3-log-writer", daemon=True)
+        self._writer.start()
+
     def emit(self, record: logging.LogRecord) -> None:
         payload = {
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(record.created)),
@@ -56,15 +76,64 @@ class JsonLogHandler(logging.Handler):
         }
         if hasattr(record, "extra_fields"):
             payload.update(record.extra_fields)
-        sys.stdout.write(json.dumps(payload) + "\n")
-        sys.stdout.flush()
-
-
-def setup_logging(level: str = "INFO") -> logging.Logger:
+        try:
+            line = orjson.dumps(payload, default=str, option=orjson.OPT_APPEND_NEWLINE)
+        except Exception:
+            self.handleError(record)
+            return
+        if self._block:
+            self._queue.put(line)
+            return
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [line for line in batch if line is not None]
+            try:
+                if lines:
+                    # Resolved per batch so redirected stdout is honoured
+                    sys.stdout.write(b"".join(lines).decode("utf-8"))
+                    sys.stdout.flush()
+            except Exception:
+                self.dropped += len(lines)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(lines) != len(batch):
+                return
+
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        if self._writer.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        super().close()
+
+
+def setup_logging(
+    level: str = "INFO",
+    queue_size: int = 10_000,
+    policy: str = "block",
+) -> logging.Logger:
     log = logging.getLogger("a3.pipeline")
-    log.handlers.clear()
+    for old in list(log.handlers):
+        log.removeHandler(old)
+        old.close()
     log.setLevel(level)
-    h = JsonLogHandler()
+    h = JsonLogHandler(queue_size=queue_size, block=policy != "drop")
     h.setLevel(level)
     log.addHandler(h)
     log.propagate = False
@@ -0,0 +1,180 @@
+"""Process-pool pipeline: the input file is split into byte ranges, one blocking loop per process."""
+
+from __future__ import annotations
+
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import psutil
+import psycopg
+from opentelemetry import trace
+
+from pipeline.blocking_runner import COMMIT_POLICIES, process_lines
+from pipeline.config import Settings
+from pipeline import db
+from pipeline import observability
+
+
+MODE = "parallel"
+
+
+def shard_ranges(dataset_path: Path, shards: int) -> list[tuple[int, int]]:
+    """
+    Split the file into up to `shards` [start, end) byte ranges that begin on line
+    boundaries. Each line belongs to the range its first byte falls in.
+    """
+    size = dataset_path.stat().st_size
+    starts = [0]
+    with open(dataset_path, "rb") as f:
+        for i in range(1, shards):
+            f.seek(size * i // shards)
+            f.readline()
+            pos = f.tell()
+            if starts[-1] < pos < size:
+                starts.append(pos)
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _read_range(dataset_path: Path, start: int, end: int, shard: int):
+    """(line_ref, line) pairs for one byte range; line_ref is '<shard>.<line within shard>'."""
+    with open(dataset_path, "rb") as f:
+        f.seek(start)
+        n = 0
+        while f.tell() < end:
+            raw = f.readline()
+            if not raw:
+                break
+            n += 1
+            yield f"{shard}.{n}", raw.decode("utf-8")
+
+
+def _run_shard(
+    dataset_path: Path, start: int, end: int, shard: int, settings: Settings, commit: str, mode: str
+) -> dict[str, Any]:
+    """Worker process entry point: own logger, tracer and DB connection; batched commits."""
+    log = observability.setup_logging(settings.log_level, settings.log_queue_size, settings.log_queue_policy)
+    tracer = observability.setup_tracing(
+        f"a3-pipeline-{mode}",
+        settings.otel_endpoint,
+        settings.trace_sample_ratio,
+    )
+    t0 = time.perf_counter()
+    try:
+        with psycopg.connect(settings.dsn_sync, autocommit=False) as conn:
+            counts = process_lines(
+                conn,
+                _read_range(dataset_path, start, end, shard),
+                settings,
+                commit=commit,
+                mode=mode,
+                log=log,
+                tracer=tracer,
+            )
+    finally:
+        # Pool processes exit without running atexit hooks: drain logs and spans here
+        for h in log.handlers:
+            h.flush()
+        shutdown = getattr(trace.get_tracer_provider(), "shutdown", None)
+        if callable(shutdown):
+            shutdown()
+    return {"shard": shard, "bytes": end - start, "duration_s": round(time.perf_counter() - t0, 4), **counts}
+
+
+def run(
+    dataset_path: Path,
+    settings: Settings | None = None,
+    workers: int | None = None,
+    commit: str = "copy",
+) -> dict[str, Any]:
+    settings = settings or Settings.from_env()
+    workers = workers or settings.parallel_workers or os.cpu_count() or 1
+    if commit not in COMMIT_POLICIES:
+        raise ValueError(f"commit policy must be one of {COMMIT_POLICIES}, got {commit!r}")
+    # Policy in the label, as with blocking-batch / blocking-copy, so runs stay distinguishable in the CSV
+    mode = f"{MODE}-{commit}"
+    log = observability.setup_logging(settings.log_level, settings.log_queue_size, settings.log_queue_policy)
+
+    summary_path = os.getenv("BENCHMARK_SUMMARY", "results/benchmark_summary.json")
+    csv_path = os.getenv("BENCHMARK_CSV", "results/benchmark.csv")
+
+    proc = psutil.Process()
+    t0 = time.perf_counter()
+
+    # Once, up front: concurrent CREATE TABLE IF NOT EXISTS from every worker can race
+    with psycopg.connect(settings.dsn_sync, autocommit=False) as conn:
+        db.init_schema_sync(conn)
+
+    ranges = shard_ranges(dataset_path, workers)
+    # spawn, not fork: the parent already runs the log writer thread
+    with ProcessPoolExecutor(max_workers=len(ranges), mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            pool.submit(_run_shard, dataset_path, start, end, shard, settings, commit, mode)
+            for shard, (start, end) in enumerate(ranges)
+        ]
+        shards = [f.result() for f in futures]
+
+    duration = time.perf_counter() - t0
+    processed = sum(s["processed"] for s in shards)
+    errors = sum(s["errors"] for s in shards)
+    alerts = sum(s["alerts"] for s in shards)
+    # Workers run concurrently, so the footprint is the sum of their peaks plus the parent
+    peak_mb = (proc.memory_info().rss + sum(s["peak_rss"] for s in shards)) / (1024 * 1024)
+    eps = processed / duration if duration > 0 else 0.0
+
+    dataset_label = dataset_path.stem
+    row = {
+        "dataset": dataset_label,
+        "mode": mode,
+        "event_count": processed,
+        "duration_s": round(duration, 4),
+        "events_per_s": round(eps, 2),
+        "peak_rss_mb": round(peak_mb, 2),
+        "errors": errors,
+        "alerts": alerts,
+    }
+
+    observability.log_extra(
+        log,
+        "run_complete",
+        mode=mode,
+        alerts_raised=alerts,
+        workers=len(shards),
+        **{k: v for k, v in row.items() if k != "mode"},
+    )
+
+    Path(summary_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(summary_path, "w", encoding="utf-8") as sf:
+        json.dump({**row, "workers": shards}, sf, indent=2)
+
+    _append_csv(csv_path, row)
+
+    return row
+
+
+def _append_csv(path: str, row: dict[str, Any]) -> None:
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    write_header = not p.exists()
+    with open(p, "a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(
+            f,
+            fieldnames=[
+                "dataset",
+                "mode",
+                "event_count",
+                "duration_s",
+                "events_per_s",
+                "peak_rss_mb",
+                "errors",
+                "alerts",
+            ],
+        )
+        if write_header:
+            w.writeheader()
+        w.writerow(row)
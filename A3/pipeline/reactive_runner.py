@@ -1,4 +1,4 @@
-"""Async pipeline: bounded queue + fixed worker pool; asyncpg for persist."""
+"""Async pipeline: bounded queue + fixed worker pool; asyncpg for persist (per event or micro-batched)."""
 
 from __future__ import annotations
 
@@ -20,6 +20,7 @@ from pipeline import stages
 
 
 MODE = "reactive"
+BATCHED_MODE = "reactive-batched"
 
 
 def _payload(ne: stages.NormalizedEvent) -> dict[str, Any]:
@@ -35,11 +36,22 @@ def _payload(ne: stages.NormalizedEvent) -> dict[str, Any]:
     }
 
 
-async def run(dataset_path: Path, settings: Settings | None = None) -> dict[str, Any]:
+def _record(ne: stages.NormalizedEvent, score: float, alert: bool) -> tuple[Any, ...]:
+    """Row for db.insert_processed_batch_async, in db.PROCESSED_COLUMNS order"""
+    return (ne.event_id, ne.sensor_id, ne.event_type, json.dumps(_payload(ne)), score, alert)
+
+
+async def run(dataset_path: Path, settings: Settings | None = None, batched: bool = False) -> dict[str, Any]:
+    """
+    With batched=True, workers stop at analyze and hand events to a bounded persist queue.
+    PERSIST_FLUSHERS tasks drain it into batches of up to PERSIST_BATCH_SIZE rows, or whatever
+    arrived within PERSIST_BATCH_WAIT_MS, and write each batch with a single COPY.
+    """
     settings = settings or Settings.from_env()
-    log = observability.setup_logging(settings.log_level)
+    mode = BATCHED_MODE if batched else MODE
+    log = observability.setup_logging(settings.log_level, settings.log_queue_size, settings.log_queue_policy)
     tracer = observability.setup_tracing(
-        "a3-pipeline-reactive",
+        f"a3-pipeline-{mode}",
         settings.otel_endpoint,
         settings.trace_sample_ratio,
     )
@@ -54,23 +66,26 @@ async def run(dataset_path: Path, settings: Settings | None = None) -> dict[str,
     alerts = 0
     processed_lock = asyncio.Lock()
 
-    async def bump_processed() -> None:
+    async def bump_processed(n: int = 1) -> None:
         nonlocal processed
         async with processed_lock:
-            processed += 1
-            observability.metrics_inc_processed(MODE)
+            processed += n
+            for _ in range(n):
+                observability.metrics_inc_processed(mode)
 
-    async def bump_errors() -> None:
+    async def bump_errors(n: int = 1) -> None:
         nonlocal errors
         async with processed_lock:
-            errors += 1
+            errors += n
 
-    async def bump_alerts() -> None:
+    async def bump_alerts(n: int = 1) -> None:
         nonlocal alerts
         async with processed_lock:
-            alerts += 1
+            alerts += n
 
     queue: asyncio.Queue = asyncio.Queue(maxsize=settings.queue_maxsize)
+    # Bounded too: when flushes fall behind, workers wait here and backpressure reaches the producer
+    persist_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.persist_batch_size * 2)
 
     pool = await asyncpg.create_pool(
         settings.dsn_async,
@@ -110,18 +125,18 @@ async def run(dataset_path: Path, settings: Settings | None = None) -> dict[str,
 
                 t_val = time.perf_counter()
                 with observability.stage_span(
-                    tracer, "validate", sample=sample, attributes={"mode": MODE, "worker": worker_id}
+                    tracer, "validate", sample=sample, attributes={"mode": mode, "worker": worker_id}
                 ):
                     ok, err = stages.validate(raw)
-                observability.metrics_observe_stage(MODE, "validate", time.perf_counter() - t_val)
+                observability.metrics_observe_stage(mode, "validate", time.perf_counter() - t_val)
 
                 if not ok:
                     await bump_errors()
-                    observability.metrics_inc_validation_error(MODE)
+                    observability.metrics_inc_validation_error(mode)
                     observability.log_extra(
                         log,
                         "validation_failed",
-                        mode=MODE,
+                        mode=mode,
                         correlation_id=raw.get("event_id", f"line_{line_num}"),
                         stage="validate",
                         error=err,
@@ -130,24 +145,29 @@ async def run(dataset_path: Path, settings: Settings | None = None) -> dict[str,
 
                 t_norm = time.perf_counter()
                 with observability.stage_span(
-                    tracer, "normalize", sample=sample, attributes={"mode": MODE, "worker": worker_id}
+                    tracer, "normalize", sample=sample, attributes={"mode": mode, "worker": worker_id}
                 ):
                     ne = stages.normalize(raw)
-                observability.metrics_observe_stage(MODE, "normalize", time.perf_counter() - t_norm)
+                observability.metrics_observe_stage(mode, "normalize", time.perf_counter() - t_norm)
 
                 t_an = time.perf_counter()
                 with observability.stage_span(
-                    tracer, "analyze", sample=sample, attributes={"mode": MODE, "worker": worker_id}
+                    tracer, "analyze", sample=sample, attributes={"mode": mode, "worker": worker_id}
                 ):
                     score = stages.analyze(ne)
-                observability.metrics_observe_stage(MODE, "analyze", time.perf_counter() - t_an)
+                observability.metrics_observe_stage(mode, "analyze", time.perf_counter() - t_an)
 
                 alert = stages.should_alert(score)
 
+                if batched:
+                    # Persist and alert accounting happen once the batch is written
+                    await persist_queue.put((ne, score, alert))
+                    continue
+
                 t_db = time.perf_counter()
                 try:
                     with observability.stage_span(
-                        tracer, "persist", sample=sample, attributes={"mode": MODE, "worker": worker_id}
+                        tracer, "persist", sample=sample, attributes={"mode": mode, "worker": worker_id}
                     ):
                         async with pool.acquire() as conn:
                             await db.insert_processed_async(
@@ -161,33 +181,129 @@ async def run(dataset_path: Path, settings: Settings | None = None) -> dict[str,
                             )
                 except Exception as e:
                     await bump_errors()
-                    observability.metrics_inc_db_error(MODE)
+                    observability.metrics_inc_db_error(mode)
                     observability.log_extra(
                         log,
                         "db_error",
-                        mode=MODE,
+                        mode=mode,
                         correlation_id=ne.event_id,
                         stage="persist",
                         error=str(e),
                     )
                     continue
-                observability.metrics_observe_stage(MODE, "persist", time.perf_counter() - t_db)
+                observability.metrics_observe_stage(mode, "persist", time.perf_counter() - t_db)
 
                 with observability.stage_span(
-                    tracer, "alert", sample=sample, attributes={"mode": MODE, "worker": worker_id}
+                    tracer, "alert", sample=sample, attributes={"mode": mode, "worker": worker_id}
                 ):
                     if alert:
                         await bump_alerts()
-                        observability.metrics_inc_alert(MODE)
+                        observability.metrics_inc_alert(mode)
 
                 await bump_processed()
             finally:
                 queue.task_done()
 
+    async def persist_one_by_one(batch: list[tuple[stages.NormalizedEvent, float, bool]]) -> list[bool]:
+        """Fallback after a failed COPY: insert each row on its own so errors land on the right event"""
+        written = []
+        for ne, score, alert in batch:
+            try:
+                async with pool.acquire() as conn:
+                    await db.insert_processed_async(
+                        conn,
+                        event_id=ne.event_id,
+                        sensor_id=ne.sensor_id,
+                        event_type=ne.event_type,
+                        payload=_payload(ne),
+                        anomaly_score=score,
+                        alert_raised=alert,
+                    )
+                written.append(True)
+            except Exception as e:
+                written.append(False)
+                observability.metrics_inc_db_error(mode)
+                observability.log_extra(
+                    log,
+                    "db_error",
+                    mode=mode,
+                    correlation_id=ne.event_id,
+                    stage="persist",
+                    error=str(e),
+                )
+        return written
+
+    async def flush(batch: list[tuple[stages.NormalizedEvent, float, bool]], flusher_id: int) -> None:
+        sample = observability.should_sample(settings.trace_sample_ratio)
+        t_db = time.perf_counter()
+        try:
+            with observability.stage_span(
+                tracer,
+                "persist",
+                sample=sample,
+                attributes={"mode": mode, "flusher": flusher_id, "batch_size": len(batch)},
+            ):
+                async with pool.acquire() as conn:
+                    await db.insert_processed_batch_async(conn, [_record(*item) for item in batch])
+            written = [True] * len(batch)
+        except Exception as e:
+            observability.log_extra(
+                log,
+                "batch_persist_failed",
+                mode=mode,
+                stage="persist",
+                batch_size=len(batch),
+                error=str(e),
+            )
+            written = await persist_one_by_one(batch)
+        # One observation per batch: the histogram shows flush latency, not per-row latency
+        observability.metrics_observe_stage(mode, "persist", time.perf_counter() - t_db)
+
+        ok = sum(written)
+        raised = sum(1 for (_, _, alert), w in zip(batch, written) if w and alert)
+        with observability.stage_span(tracer, "alert", sample=sample, attributes={"mode": mode}):
+            for _ in range(raised):
+                observability.metrics_inc_alert(mode)
+        await bump_errors(len(batch) - ok)
+        await bump_alerts(raised)
+        await bump_processed(ok)
+
+    async def flusher(flusher_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        max_wait = settings.persist_batch_wait_ms / 1000
+        stopping = False
+        while not stopping:
+            first = await persist_queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + max_wait
+            while len(batch) < settings.persist_batch_size:
+                try:
+                    # Take whatever is already queued without creating a timeout per row
+                    item = persist_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(persist_queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await flush(batch, flusher_id)
+
     prod_task = asyncio.create_task(producer())
     workers = [asyncio.create_task(worker(i)) for i in range(settings.worker_count)]
+    flushers = [asyncio.create_task(flusher(i)) for i in range(settings.persist_flushers)] if batched else []
     await prod_task
     await asyncio.gather(*workers)
+    for _ in flushers:
+        await persist_queue.put(None)
+    await asyncio.gather(*flushers)
 
     await pool.close()
 
@@ -199,7 +315,7 @@ async def run(dataset_path: Path, settings: Settings | None = None) -> dict[str,
     dataset_label = dataset_path.stem
     row = {
         "dataset": dataset_label,
-        "mode": MODE,
+        "mode": mode,
         "event_count": processed,
         "duration_s": round(duration, 4),
         "events_per_s": round(eps, 2),
@@ -211,7 +327,7 @@ async def run(dataset_path: Path, settings: Settings | None = None) -> dict[str,
     observability.log_extra(
         log,
         "run_complete",
-        mode=MODE,
+        mode=mode,
         alerts_raised=alerts,
         **{k: v for k, v in row.items() if k != "mode"},
     )
@@ -248,5 +364,5 @@ def _append_csv(path: str, row: dict[str, Any]) -> None:
         w.writerow(row)
 
 
-def run_sync(dataset_path: Path, settings: Settings | None = None) -> dict[str, Any]:
-    return asyncio.run(run(dataset_path, settings))
+def run_sync(dataset_path: Path, settings: Settings | None = None, batched: bool = False) -> dict[str, Any]:
+    return asyncio.run(run(dataset_path, settings, batched))
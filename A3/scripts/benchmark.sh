@@ -25,11 +25,29 @@ for SIZE in small medium large; do
     pipeline \
     python -m pipeline run-blocking --dataset "/app/data/${SIZE}.jsonl"
 
+  docker compose run --rm \
+    -e BENCHMARK_CSV=/app/results/benchmark.csv \
+    -e BENCHMARK_SUMMARY=/app/results/summary_blocking_copy_"${SIZE}".json \
+    pipeline \
+    python -m pipeline run-blocking --commit copy --dataset "/app/data/${SIZE}.jsonl"
+
   docker compose run --rm \
     -e BENCHMARK_CSV=/app/results/benchmark.csv \
     -e BENCHMARK_SUMMARY=/app/results/summary_reactive_"${SIZE}".json \
     pipeline \
     python -m pipeline run-reactive --dataset "/app/data/${SIZE}.jsonl"
+
+  docker compose run --rm \
+    -e BENCHMARK_CSV=/app/results/benchmark.csv \
+    -e BENCHMARK_SUMMARY=/app/results/summary_reactive_batched_"${SIZE}".json \
+    pipeline \
+    python -m pipeline run-reactive-batched --dataset "/app/data/${SIZE}.jsonl"
+
+  docker compose run --rm \
+    -e BENCHMARK_CSV=/app/results/benchmark.csv \
+    -e BENCHMARK_SUMMARY=/app/results/summary_parallel_"${SIZE}".json \
+    pipeline \
+    python -m pipeline run-parallel --dataset "/app/data/${SIZE}.jsonl"
 done
 
 echo "Plotting charts..."
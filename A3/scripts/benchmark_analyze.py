@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Microbenchmark: scalar analyze()/should_alert() vs analyze_batch()/should_alert_batch()."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Allow running from host: cd A3 && python scripts/benchmark_analyze.py
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from pipeline import stages  # noqa: E402
+
+
+def load_events(path: Path) -> list[stages.NormalizedEvent]:
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            raw = json.loads(line)
+            ok, _ = stages.validate(raw)
+            if ok:
+                events.append(stages.normalize(raw))
+    return events
+
+
+def time_ms(fn, repeat: int) -> dict[str, float]:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {"p50_ms": round(statistics.median(samples), 3), "min_ms": round(min(samples), 3)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dataset", type=Path, required=True, help="JSONL from `python -m pipeline generate`")
+    ap.add_argument("--batch-size", type=int, default=500, help="Events per analyze_batch call")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--output", type=Path, default=Path("results/analyze_benchmark.json"))
+    args = ap.parse_args()
+
+    events = load_events(args.dataset)
+    types = [ne.event_type for ne in events]
+    values = [ne.value for ne in events]
+    chunks = [
+        (types[i : i + args.batch_size], values[i : i + args.batch_size])
+        for i in range(0, len(events), args.batch_size)
+    ]
+
+    def scalar():
+        scores = [stages.analyze(ne) for ne in events]
+        return scores, [stages.should_alert(s) for s in scores]
+
+    def batched(exact: bool):
+        def run():
+            scores = [stages.analyze_batch(t, v, exact=exact) for t, v in chunks]
+            return scores, [stages.should_alert_batch(s) for s in scores]
+
+        return run
+
+    scalar_scores, scalar_alerts = scalar()
+    batch_scores, batch_alerts = batched(True)()
+    fast_scores, _ = batched(False)()
+    expected = np.array(scalar_scores, dtype=np.float64)
+    batch_scores = np.concatenate(batch_scores) if batch_scores else np.empty(0)
+    fast_scores = np.concatenate(fast_scores) if fast_scores else np.empty(0)
+
+    report = {
+        "dataset": args.dataset.stem,
+        "events": len(events),
+        "batch_size": args.batch_size,
+        "identical_scores": batch_scores.tobytes() == expected.tobytes(),
+        "identical_alerts": bool(np.array_equal(np.concatenate(batch_alerts) if batch_alerts else [], scalar_alerts)),
+        "np_tanh_mismatches": int((fast_scores != expected).sum()),
+        "scalar": time_ms(scalar, args.repeat),
+        "batch_exact": time_ms(batched(True), args.repeat),
+        "batch_np_tanh": time_ms(batched(False), args.repeat),
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Per-event memory and throughput: NormalizedEvent with __dict__ (before) vs slots (after) vs columnar lists."""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Allow running from host: cd A3 && python scripts/benchmark_events.py
+_ROOT = Path(__file__).resolve().parents[1]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from pipeline import stages  # noqa: E402
+
+
+@dataclass
+class LegacyNormalizedEvent:
+    """stages.NormalizedEvent before slots=True"""
+
+    event_id: str
+    sensor_id: str
+    event_type: str
+    value: float
+    unit: str
+    timestamp_iso: str
+    severity: str
+    raw_location: dict[str, Any] | None
+
+
+def build_legacy(fields):
+    return [LegacyNormalizedEvent(*f) for f in fields]
+
+
+def build_slotted(fields):
+    return [stages.NormalizedEvent(*f) for f in fields]
+
+
+def build_columnar(fields):
+    # One list per field; the lower bound for holding the same events
+    return [list(column) for column in zip(*fields)]
+
+
+def measure(build, fields) -> dict[str, Any]:
+    """Field values are shared by every representation, so only container overhead is counted."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    events = build(fields)
+    elapsed = time.perf_counter() - t0
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    n = len(fields)
+    return {
+        "bytes_per_event": round(retained / n, 1) if n else 0.0,
+        "retained_mb": round(retained / (1024 * 1024), 2),
+        "build_events_per_s": round(n / elapsed, 0) if elapsed > 0 else 0.0,
+        "_events": events,
+    }
+
+
+def analyze_rate(events) -> float:
+    t0 = time.perf_counter()
+    for ne in events:
+        stages.should_alert(stages.analyze(ne))
+    elapsed = time.perf_counter() - t0
+    return round(len(events) / elapsed, 0) if elapsed > 0 else 0.0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dataset", type=Path, required=True, help="JSONL from `python -m pipeline generate`")
+    ap.add_argument("--output", type=Path, default=Path("results/event_memory_benchmark.json"))
+    args = ap.parse_args()
+
+    fields = []
+    with open(args.dataset, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            raw = json.loads(line)
+            if stages.validate(raw)[0]:
+                fields.append(dataclasses.astuple(stages.normalize(raw)))
+
+    report: dict[str, Any] = {"dataset": args.dataset.stem, "events": len(fields)}
+    for name, build in (("dict", build_legacy), ("slots", build_slotted), ("columnar", build_columnar)):
+        result = measure(build, fields)
+        events = result.pop("_events")
+        if name != "columnar":
+            result["analyze_events_per_s"] = analyze_rate(events)
+        report[name] = result
+        del events
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
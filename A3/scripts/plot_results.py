@@ -38,64 +38,39 @@ def main() -> int:
         mode = r["mode"]
         by_ds[ds][mode] = r
 
-    modes = ["blocking", "reactive"]
+    # Every mode found in the CSV, blocking/reactive first so existing charts keep their colours
+    modes = [m for m in ("blocking", "reactive") if any(m in by_ds[ds] for ds in order)]
+    modes += sorted({m for ds in order for m in by_ds[ds]} - set(modes))
     x_labels = order
     x = range(len(x_labels))
-    width = 0.35
+    width = 0.7 / max(len(modes), 1)
 
-    def floats(key: str) -> tuple[list[float], list[float]]:
-        b, rx = [], []
-        for ds in order:
-            m = by_ds[ds]
-            b.append(float(m.get("blocking", {}).get(key, 0) or 0))
-            rx.append(float(m.get("reactive", {}).get(key, 0) or 0))
-        return b, rx
+    def floats(key: str) -> dict[str, list[float]]:
+        return {mode: [float(by_ds[ds].get(mode, {}).get(key, 0) or 0) for ds in order] for mode in modes}
 
-    args.out_dir.mkdir(parents=True, exist_ok=True)
-
-    # Throughput
-    fig, ax = plt.subplots(figsize=(8, 4))
-    tb, tr = floats("events_per_s")
-    ax.bar([i - width / 2 for i in x], tb, width, label="blocking")
-    ax.bar([i + width / 2 for i in x], tr, width, label="reactive")
-    ax.set_ylabel("Events / second")
-    ax.set_title("Pipeline throughput by dataset")
-    ax.set_xticks(list(x))
-    ax.set_xticklabels(x_labels)
-    ax.legend()
-    fig.tight_layout()
-    fig.savefig(args.out_dir / "throughput.png", dpi=120)
-    plt.close(fig)
-
-    # Runtime
-    fig, ax = plt.subplots(figsize=(8, 4))
-    rb, rr = floats("duration_s")
-    ax.bar([i - width / 2 for i in x], rb, width, label="blocking")
-    ax.bar([i + width / 2 for i in x], rr, width, label="reactive")
-    ax.set_ylabel("Seconds (total run)")
-    ax.set_title("Total runtime by dataset")
-    ax.set_xticks(list(x))
-    ax.set_xticklabels(x_labels)
-    ax.legend()
-    fig.tight_layout()
-    fig.savefig(args.out_dir / "runtime.png", dpi=120)
-    plt.close(fig)
-
-    # Memory if present
-    if any(float(r.get("peak_rss_mb") or 0) > 0 for r in rows):
+    def bar_chart(key: str, ylabel: str, title: str, filename: str) -> None:
         fig, ax = plt.subplots(figsize=(8, 4))
-        mb, mr = floats("peak_rss_mb")
-        ax.bar([i - width / 2 for i in x], mb, width, label="blocking")
-        ax.bar([i + width / 2 for i in x], mr, width, label="reactive")
-        ax.set_ylabel("Peak RSS (MB)")
-        ax.set_title("Peak process memory by dataset")
+        for n, (mode, values) in enumerate(floats(key).items()):
+            offset = (n - (len(modes) - 1) / 2) * width
+            ax.bar([i + offset for i in x], values, width, label=mode)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
         ax.set_xticks(list(x))
         ax.set_xticklabels(x_labels)
         ax.legend()
         fig.tight_layout()
-        fig.savefig(args.out_dir / "memory.png", dpi=120)
+        fig.savefig(args.out_dir / filename, dpi=120)
         plt.close(fig)
 
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    bar_chart("events_per_s", "Events / second", "Pipeline throughput by dataset", "throughput.png")
+    bar_chart("duration_s", "Seconds (total run)", "Total runtime by dataset", "runtime.png")
+
+    # Memory if present
+    if any(float(r.get("peak_rss_mb") or 0) > 0 for r in rows):
+        bar_chart("peak_rss_mb", "Peak RSS (MB)", "Peak process memory by dataset", "memory.png")
+
     print(f"Wrote charts to {args.out_dir.resolve()}")
     return 0
 
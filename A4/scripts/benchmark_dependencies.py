@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Per-request dependency resolution cost: object graph rebuilt per request vs the shared container."""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SERVICES_DIR = Path(__file__).resolve().parents[1] / "services"
+SERVICE_DIRS = {
+    "sensor": SERVICES_DIR / "python-sensor-service/src",
+    "command": SERVICES_DIR / "python-command-service/src",
+}
+
+
+def build_sensor_graph_per_request(pool):
+    """What dependencies.get_sensor_controller used to do on every request"""
+    from config.config import Config
+    from services.logger import Logger
+    from repositories.sensor_repository import SensorRepository
+    from services.sensor_service import SensorService
+    from controllers.sensor_controller import SensorController
+    from events.sensor_event_publisher import SensorEventPublisher
+
+    config = Config()
+    service = SensorService(SensorRepository(pool), Logger(config), SensorEventPublisher())
+    return SensorController(service, Logger(config)), []
+
+
+def build_command_graph_per_request(pool):
+    """What dependencies.get_command_controller used to do on every request"""
+    from config.config import Config
+    from services.logger import Logger
+    from repositories.dashboard_repository import DashboardRepository
+    from repositories.alert_repository import AlertRepository
+    from services.command_service import CommandService
+    from controllers.command_controller import CommandController
+    from clients.sensor_client import SensorClient
+
+    config = Config()
+    sensor_client = SensorClient()
+    service = CommandService(DashboardRepository(pool), AlertRepository(pool), sensor_client, Logger(config))
+    return CommandController(service, Logger(config)), [sensor_client]
+
+
+async def time_us(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _, leftovers = await fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+        # Per-request clients are closed outside the timed section
+        for client in leftovers:
+            await client.close()
+    return {
+        "p50_us": round(statistics.median(samples), 2),
+        "p99_us": round(sorted(samples)[int(len(samples) * 0.99) - 1], 2),
+        "mean_us": round(statistics.fmean(samples), 2),
+    }
+
+
+async def main_async(args):
+    sys.path.insert(0, str(SERVICE_DIRS[args.service]))
+    import dependencies
+
+    # Repositories only hold the pool reference, so no database is needed to build the graph
+    dependencies._container = dependencies.Container(None)
+    if args.service == "sensor":
+        build_graph = build_sensor_graph_per_request
+        controller = dependencies.get_sensor_controller
+    else:
+        build_graph = build_command_graph_per_request
+        controller = dependencies.get_command_controller
+
+    async def before():
+        return build_graph(None)
+
+    async def after():
+        return await controller(), []
+
+    # Warm imports and lazy initialisation before measuring
+    await time_us(before, 10)
+    await time_us(after, 10)
+
+    report = {
+        "service": args.service,
+        "iterations": args.iterations,
+        "per_request_graph": await time_us(before, args.iterations),
+        "shared_container": await time_us(after, args.iterations),
+    }
+    if hasattr(dependencies._container, "close"):
+        await dependencies._container.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A4 per-request dependency overhead benchmark")
+    parser.add_argument("--service", choices=sorted(SERVICE_DIRS), required=True)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--output", required=True, help="Output JSON path")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
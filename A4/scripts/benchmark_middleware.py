@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Requests/sec through the Python services' middleware: BaseHTTPMiddleware (before) vs pure ASGI (after)."""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+SERVICES_DIR = Path(__file__).resolve().parents[1] / "services"
+SERVICE_DIRS = {
+    "sensor": SERVICES_DIR / "python-sensor-service/src",
+    "command": SERVICES_DIR / "python-command-service/src",
+}
+
+
+def legacy_middleware(service: str):
+    """The BaseHTTPMiddleware classes the services used before the pure ASGI rewrite"""
+    from fastapi import HTTPException
+    from starlette.middleware import Middleware
+    from starlette.middleware.base import BaseHTTPMiddleware
+    from middleware.correlation_id import correlation_id_var
+
+    class CorrelationIdMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            correlation_id = request.headers.get('x-correlation-id') or f'req-{uuid.uuid4().hex[:16]}'
+            request.state.correlation_id = correlation_id
+            token = correlation_id_var.set(correlation_id)
+            try:
+                response = await call_next(request)
+            finally:
+                correlation_id_var.reset(token)
+            response.headers['X-Correlation-ID'] = correlation_id
+            return response
+
+    if service == "sensor":
+        return [Middleware(CorrelationIdMiddleware)]
+
+    class RateLimiter:
+        def __init__(self, rate: float, capacity: int):
+            self.rate = rate
+            self.capacity = capacity
+            self.tokens = capacity
+            self.last_check = time.time()
+
+        def allow_request(self) -> bool:
+            now = time.time()
+            elapsed = now - self.last_check
+            self.last_check = now
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    # Limits raised to measure middleware cost, not the request budget
+    general_limiter = RateLimiter(1e9, 10 ** 9)
+    write_limiter = RateLimiter(1e9, 10 ** 9)
+
+    class RateLimiterMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            is_write_operation = request.method in ['POST', 'PATCH', 'PUT', 'DELETE']
+            limiter = write_limiter if is_write_operation else general_limiter
+            if limiter.allow_request():
+                return await call_next(request)
+            raise HTTPException(status_code=429, detail="Rate limit exceeded")
+
+    # Same order as app.add_middleware(...) produces: last added is outermost
+    return [Middleware(RateLimiterMiddleware), Middleware(CorrelationIdMiddleware)]
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> dict:
+    remaining = iter(range(requests))
+    failures = 0
+
+    async def worker():
+        nonlocal failures
+        for _ in remaining:
+            response = await client.get(path)
+            if response.status_code != 200:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"requests": requests, "failures": failures, "requests_per_sec": round(requests / elapsed, 1)}
+
+
+async def bench_variant(app, paths, args) -> dict:
+    # Rebuild the middleware stack on the next request
+    app.middleware_stack = None
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in paths:
+            await measure(client, path, min(200, args.requests), args.concurrency)  # warm-up
+            results[path] = await measure(client, path, args.requests, args.concurrency)
+    return results
+
+
+async def main_async(args):
+    sys.path.insert(0, str(SERVICE_DIRS[args.service]))
+    # Measure middleware cost, not the configured request budget (read when the stack is built)
+    os.environ.setdefault("RATE_LIMIT_RATE", "1e9")
+    os.environ.setdefault("RATE_LIMIT_BURST", str(10 ** 9))
+    from app import app
+
+    paths = ["/health"] + ([f"/sensors/{args.sensor_id}"] if args.service == "sensor" else [])
+    current = list(app.user_middleware)
+
+    variants = {"base_http_middleware": legacy_middleware(args.service), "pure_asgi": current}
+    report = {"service": args.service, "concurrency": args.concurrency, "rounds": args.rounds}
+    async with app.router.lifespan_context(app):
+        # Alternate variants each round and keep the best run, so ordering and warm-up do not bias either
+        for _ in range(args.rounds):
+            for name, middleware in variants.items():
+                app.user_middleware = middleware
+                results = await bench_variant(app, paths, args)
+                best = report.setdefault(name, results)
+                for path, result in results.items():
+                    if result["requests_per_sec"] > best[path]["requests_per_sec"]:
+                        best[path] = result
+        app.user_middleware = current
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A4 middleware throughput benchmark (in-process ASGI)")
+    parser.add_argument("--service", choices=sorted(SERVICE_DIRS), required=True)
+    parser.add_argument("--sensor-id", default="temp_living_room", help="Existing sensor for GET /sensors/{id}")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", required=True, help="Output JSON path")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Serialization cost per 1k sensor rows: stdlib JSON (before) vs orjson (after) over the repository's row mapping."""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import asyncpg
+
+SENSOR_SERVICE_DIR = Path(__file__).resolve().parents[1] / "services/python-sensor-service/src"
+
+# Same column shape as the sensors table, generated so no seeded data is needed
+ROWS_SQL = """
+    SELECT 'sensor_' || g AS sensor_id, 'temperature'::varchar AS type, (g % 100 + 0.5)::numeric(10, 2) AS value,
+           'F'::varchar AS unit, (now() - g * INTERVAL '1 second')::timestamp AS timestamp
+    FROM generate_series(1, $1) g
+"""
+
+# Postgres builds the document itself; output differs in number/timestamp formatting, so reference only
+JSON_AGG_SQL = f"SELECT json_build_object('data', json_agg(r), 'count', count(*))::text FROM ({ROWS_SQL}) r"
+
+
+async def time_us(fn, iterations: int) -> dict:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return {"p50_us": round(statistics.median(samples), 1), "mean_us": round(statistics.fmean(samples), 1)}
+
+
+async def main_async(args):
+    sys.path.insert(0, str(SENSOR_SERVICE_DIR))
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from repositories.sensor_repository import _to_dict
+
+    # GET /sensors is declared with response_model=dict
+    field = create_response_field(name="Response_get_all_sensors", type_=dict)
+    conn = await asyncpg.connect(args.sensor_dsn)
+    rows = await conn.fetch(ROWS_SQL, args.rows)
+
+    async def map_rows():
+        return [_to_dict(row) for row in rows]
+
+    payload = {'data': await map_rows(), 'count': len(rows)}
+    before_body = JSONResponse(await serialize_response(field=field, response_content=payload)).body
+    after_body = ORJSONResponse(await serialize_response(field=field, response_content=payload)).body
+
+    async def encode_before():
+        return JSONResponse(await serialize_response(field=field, response_content=payload)).body
+
+    async def encode_after():
+        return ORJSONResponse(await serialize_response(field=field, response_content=payload)).body
+
+    async def end_to_end_before():
+        fetched = await conn.fetch(ROWS_SQL, args.rows)
+        content = {'data': [_to_dict(row) for row in fetched], 'count': len(fetched)}
+        return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def end_to_end_after():
+        fetched = await conn.fetch(ROWS_SQL, args.rows)
+        content = {'data': [_to_dict(row) for row in fetched], 'count': len(fetched)}
+        return ORJSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def end_to_end_postgres_json():
+        return (await conn.fetchval(JSON_AGG_SQL, args.rows)).encode('utf-8')
+
+    stages = {
+        "validate_and_encode": (encode_before, encode_after),
+        "fetch_map_encode": (end_to_end_before, end_to_end_after),
+    }
+    report = {
+        "rows": args.rows,
+        "iterations": args.iterations,
+        "identical_body": before_body == after_body,
+        "body_bytes": len(after_body),
+    }
+    # Same mapping on both sides; reported once for scale
+    await time_us(map_rows, 5)
+    report["map_rows"] = await time_us(map_rows, args.iterations)
+    for name, (before, after) in stages.items():
+        await time_us(before, 5)
+        await time_us(after, 5)
+        report[name] = {
+            "before": await time_us(before, args.iterations),
+            "after": await time_us(after, args.iterations),
+        }
+    report["fetch_postgres_json_reference"] = await time_us(end_to_end_postgres_json, args.iterations)
+    await conn.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A4 response serialization benchmark")
+    parser.add_argument("--sensor-dsn", required=True, help="Any reachable Postgres; no tables are read")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", required=True, help="Output JSON path")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
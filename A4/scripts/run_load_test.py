@@ -24,7 +24,7 @@ def request_json(method: str, url: str, token: str, payload: dict | None = None,
         return resp.status, (json.loads(raw) if raw else {})
 
 
-def run_dataset(base_url: str, token: str, size: int, timeout: float):
+def run_dataset(sensor_url: str, command_url: str, token: str, size: int, timeout: float, profile: str = "full"):
     latencies_ms = []
     failures = 0
     # Unique per invocation so repeated experiments do not 409/400 on existing DB rows.
@@ -48,15 +48,16 @@ def run_dataset(base_url: str, token: str, size: int, timeout: float):
         }
         start = time.perf_counter()
         try:
-            request_json("POST", f"{base_url}:3000/sensors", token, sensor_payload, timeout)
-            request_json("POST", f"{base_url}:3001/dashboards", token, dash_payload, timeout)
-            request_json(
-                "POST",
-                f"{base_url}:3001/threat-assessment",
-                token,
-                {"sensor_ids": [sensor_id]},
-                timeout,
-            )
+            request_json("POST", f"{sensor_url}/sensors", token, sensor_payload, timeout)
+            if profile == "full":
+                request_json("POST", f"{command_url}/dashboards", token, dash_payload, timeout)
+                request_json(
+                    "POST",
+                    f"{command_url}/threat-assessment",
+                    token,
+                    {"sensor_ids": [sensor_id]},
+                    timeout,
+                )
         except (urllib.error.HTTPError, urllib.error.URLError, TimeoutError):
             failures += 1
         finally:
@@ -73,6 +74,7 @@ def run_dataset(base_url: str, token: str, size: int, timeout: float):
     )
     return {
         "run_suffix": run_suffix,
+        "profile": profile,
         "events": size,
         "successes": success,
         "failures": failures,
@@ -87,13 +89,23 @@ def run_dataset(base_url: str, token: str, size: int, timeout: float):
 def main():
     parser = argparse.ArgumentParser(description="A4 synthetic load test runner")
     parser.add_argument("--base-url", default="http://localhost", help="Base URL host prefix")
+    parser.add_argument("--sensor-url", help="Sensor service URL (default: <base-url>:3000)")
+    parser.add_argument("--command-url", help="Command service URL (default: <base-url>:3001)")
+    parser.add_argument(
+        "--profile",
+        choices=("full", "sensor-write"),
+        default="full",
+        help="full: sensor + dashboard + threat-assessment per iteration; sensor-write: POST /sensors only",
+    )
     parser.add_argument("--token", default="replace-with-secure-key", help="Bearer token value")
     parser.add_argument("--dataset-size", type=int, required=True, help="Number of iterations")
     parser.add_argument("--timeout", type=float, default=5.0, help="Per request timeout seconds")
     parser.add_argument("--output", required=True, help="Output JSON path")
     args = parser.parse_args()
 
-    result = run_dataset(args.base_url, args.token, args.dataset_size, args.timeout)
+    sensor_url = args.sensor_url or f"{args.base_url}:3000"
+    command_url = args.command_url or f"{args.base_url}:3001"
+    result = run_dataset(sensor_url, command_url, args.token, args.dataset_size, args.timeout, args.profile)
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(result, indent=2))
@@ -1,43 +1,66 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from routes.command import router as command_router
 from middleware.correlation_id import CorrelationIdMiddleware
 from middleware.rate_limiter import RateLimiterMiddleware
-from db.connection import get_pool, initialize_database
-from dependencies import get_dashboard_repository, get_alert_repository, get_logger
+from middleware.deadline import DeadlineMiddleware
+from db.connection import get_pool, initialize_database, close_pool
+from dependencies import get_container, close_container, get_config, get_logger
 from events.event_subscriber import EventSubscriber
+from events.rabbitmq_client import close_connection
 import asyncio
-import threading
 
-app = FastAPI(
-    title="Command & Control Microservice API",
-    description="Tactical Command & Control service for military/IoT edge scenarios",
-    version="2.0.0"
-)
 
-# Add middleware
-app.add_middleware(CorrelationIdMiddleware)
-app.add_middleware(RateLimiterMiddleware)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    event_subscriber = None
+    subscriber_task = None
 
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
+    # Initialize database and the shared object graph on startup
     try:
         await initialize_database()
+        container = await get_container()
         
-        # Start event subscriber in background thread
-        dashboard_repo = await get_dashboard_repository()
-        alert_repo = await get_alert_repository()
-        logger = get_logger()
-        event_subscriber = EventSubscriber(dashboard_repo, alert_repo, logger)
-        
-        def run_subscriber():
-            event_subscriber.start()
-        
-        subscriber_thread = threading.Thread(target=run_subscriber, daemon=True)
-        subscriber_thread.start()
+        # Consume events on the app's own event loop (shares the asyncpg pool)
+        config = get_config()
+        event_subscriber = EventSubscriber(
+            container.dashboard_repository,
+            container.alert_repository,
+            container.logger,
+            prefetch_count=config.get_event_prefetch_count(),
+            max_concurrency=config.get_event_max_concurrency()
+        )
+        subscriber_task = asyncio.create_task(event_subscriber.run())
     except Exception as e:
         print(f"Failed to initialize database: {e}")
 
+    yield
+
+    if subscriber_task and not subscriber_task.done():
+        subscriber_task.cancel()
+    if event_subscriber:
+        await event_subscriber.stop()
+    await close_connection()
+    await close_container()
+    await close_pool()
+
+
+app = FastAPI(
+    title="Command & Control Microservice API",
+    description="Tactical Command & Control service for military/IoT edge scenarios",
+    version="2.0.0",
+    lifespan=lifespan,
+    # orjson encodes response bodies natively instead of the stdlib json module
+    default_response_class=ORJSONResponse
+)
+
+# Add middleware (last added runs first); 429s from the limiter and 504s from the deadline
+# still carry the correlation ID
+app.add_middleware(DeadlineMiddleware, default_timeout_ms=get_config().get_request_timeout_ms())
+app.add_middleware(RateLimiterMiddleware)
+app.add_middleware(CorrelationIdMiddleware)
+
 # Health check endpoint with database status
 @app.get("/health")
 async def health():
@@ -45,7 +68,15 @@ async def health():
         pool = await get_pool()
         async with pool.acquire() as conn:
             await conn.fetchval('SELECT 1')
-        return {"status": "ok", "service": "python-command", "database": "connected"}
+        container = await get_container()
+        return {
+            "status": "ok",
+            "service": "python-command",
+            "database": "connected",
+            "logs": get_logger().get_stats(),
+            "circuit_breakers": container.sensor_client.get_circuit_stats(),
+            "sensor_coalescing": container.sensor_client.get_coalescing_stats()
+        }
     except Exception as e:
         return {"status": "error", "service": "python-command", "database": "disconnected", "error": str(e)}
 
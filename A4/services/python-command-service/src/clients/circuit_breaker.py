@@ -0,0 +1,157 @@
+import inspect
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = 'CLOSED'
+OPEN = 'OPEN'
+HALF_OPEN = 'HALF_OPEN'
+
+# Gauge encoding for dashboards
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the dependency while the breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a rolling time window.
+
+    CLOSED: calls pass; once the window holds at least minimum_calls and the share of
+    failures reaches failure_rate_threshold, the breaker opens.
+    OPEN: calls fail fast with CircuitOpenError until recovery_timeout has passed.
+    HALF_OPEN: exactly one probe call is let through (single-flight); everyone else keeps
+    failing fast. A successful probe closes the breaker, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_seconds: int = 30,
+        recovery_timeout: float = 30.0,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.recovery_timeout = recovery_timeout
+        self.is_failure = is_failure or (lambda error: True)
+
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        # One [second, calls, failures] bucket per second of the window
+        self._buckets: deque = deque()
+        self._counters = {'calls': 0, 'failures': 0, 'rejected': 0}
+        self._transitions = {CLOSED: 0, OPEN: 0, HALF_OPEN: 0}
+
+    async def call(self, func, *args, **kwargs):
+        is_probe = self._before_call()
+        try:
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception as error:
+            self._record(is_probe, failed=self.is_failure(error))
+            raise
+        except BaseException:
+            # Cancelled: no verdict on the dependency, but free the probe slot
+            if is_probe:
+                self._probe_in_flight = False
+            raise
+        self._record(is_probe, failed=False)
+        return result
+
+    def _before_call(self) -> bool:
+        """Admit or reject a call; returns True when the call is the half-open probe"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self._counters['rejected'] += 1
+                raise CircuitOpenError(f"Circuit breaker {self.name} is OPEN: dependency unavailable")
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                self._counters['rejected'] += 1
+                raise CircuitOpenError(f"Circuit breaker {self.name} is HALF_OPEN: probe in flight")
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def _record(self, is_probe: bool, failed: bool):
+        self._counters['calls'] += 1
+        if failed:
+            self._counters['failures'] += 1
+
+        if is_probe:
+            self._probe_in_flight = False
+            if failed:
+                self._open()
+            else:
+                self._buckets.clear()
+                self._transition(CLOSED)
+            return
+
+        now = int(time.monotonic())
+        if self._buckets and self._buckets[-1][0] == now:
+            bucket = self._buckets[-1]
+        else:
+            bucket = [now, 0, 0]
+            self._buckets.append(bucket)
+        bucket[1] += 1
+        if failed:
+            bucket[2] += 1
+
+        if self.state == CLOSED and failed:
+            calls, failures = self._window_totals(now)
+            if calls >= self.minimum_calls and failures / calls >= self.failure_rate_threshold:
+                self._open()
+
+    def _window_totals(self, now: int):
+        while self._buckets and self._buckets[0][0] <= now - self.window_seconds:
+            self._buckets.popleft()
+        calls = sum(bucket[1] for bucket in self._buckets)
+        failures = sum(bucket[2] for bucket in self._buckets)
+        return calls, failures
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self._transition(OPEN)
+
+    def _transition(self, state: str):
+        if state != self.state:
+            self.state = state
+            self._transitions[state] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls, failures = self._window_totals(int(time.monotonic()))
+        return {
+            'state': self.state,
+            'state_value': STATE_VALUES[self.state],
+            'window_calls': calls,
+            'window_failure_rate': round(failures / calls, 4) if calls else 0.0,
+            **{f'{name}_total': value for name, value in self._counters.items()},
+            'transitions_total': {state.lower(): count for state, count in self._transitions.items()}
+        }
+
+
+class CircuitBreakerRegistry:
+    """One breaker per dependency endpoint, created on first use with shared settings"""
+
+    def __init__(self, **breaker_settings):
+        self._settings = breaker_settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **self._settings)
+        return breaker
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.get_stats() for name, breaker in self._breakers.items()}
@@ -0,0 +1,46 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+
+class LatencyTracker:
+    """Recent response times for one endpoint, used to pick the hedge delay"""
+
+    def __init__(self, max_samples: int = 256, min_samples: int = 20):
+        self._samples: deque = deque(maxlen=max_samples)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """None until enough samples exist to trust the estimate"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def hedged(attempt: Callable[[], Awaitable], delay: float):
+    """
+    Run attempt(); if it has not finished after delay seconds, start a second one and
+    return whichever succeeds first. The loser is cancelled. Only for idempotent reads.
+    """
+    tasks = [asyncio.ensure_future(attempt())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.append(asyncio.ensure_future(attempt()))
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded:
+                return succeeded[0].result()
+        # Every attempt failed: surface the original request's error
+        raise tasks[0].exception()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
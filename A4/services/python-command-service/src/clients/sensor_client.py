@@ -1,90 +1,169 @@
-import requests
 import httpx
 import asyncio
+import time
 from typing import List, Dict, Any, Optional
 from config.config import Config
-import time
-
-
-# Circuit Breaker implementation
-class CircuitBreaker:
-    def __init__(self, failure_threshold=5, recovery_timeout=30):
-        self.failure_threshold = failure_threshold
-        self.recovery_timeout = recovery_timeout
-        self.failures = 0
-        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
-        self.last_failure_time = None
-
-    async def call(self, func, *args, **kwargs):
-        if self.state == "OPEN":
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = "HALF_OPEN"
-            else:
-                raise Exception("Circuit breaker is OPEN: dependency unavailable")
-
-        try:
-            result = await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
-            self.failures = 0
-            self.state = "CLOSED"
-            return result
-        except Exception as e:
-            self.failures += 1
-            self.last_failure_time = time.time()
-
-            if self.failures >= self.failure_threshold:
-                self.state = "OPEN"
-
-            raise
+from middleware.correlation_id import get_correlation_id
+from middleware.deadline import DEADLINE_HEADER, DeadlineExceeded, remaining_seconds
+from clients.circuit_breaker import CircuitBreakerRegistry
+from clients.hedging import LatencyTracker, hedged
+from clients.single_flight import SingleFlight
 
 
-circuit_breaker = CircuitBreaker(5, 30)
+def is_dependency_failure(error: BaseException) -> bool:
+    """Timeouts, connection errors and 5xx count against the breaker; 4xx are the caller's fault"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    # The caller ran out of time; says nothing about the sensor service's health
+    return not isinstance(error, DeadlineExceeded)
 
 
 class SensorClient:
     def __init__(self):
         config = Config()
         self.base_url = config.get_sensor_service_url()
-        # Bulkhead: Separate session for sync calls with connection limits
-        self.sync_session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(pool_connections=5, pool_maxsize=5)
-        self.sync_session.mount('http://', adapter)
-        self.sync_session.mount('https://', adapter)
-        
-        # Bulkhead: Separate async client for async calls
+        self.lookup_chunk_size = config.get_sensor_lookup_chunk_size()
+        # One breaker per endpoint: a failing lookup route does not cut off single-sensor reads
+        self.breakers = CircuitBreakerRegistry(
+            is_failure=is_dependency_failure,
+            **config.get_circuit_breaker_settings()
+        )
+        self.hedging_enabled = config.get_sensor_hedging_enabled()
+        self.hedge_min_delay = config.get_sensor_hedge_min_delay_ms() / 1000
+        self.latencies: Dict[str, LatencyTracker] = {}
+        # Identical concurrent reads (same ids, same filters) share one request
+        self.flights = SingleFlight()
+
+        # Bulkhead: Separate async client with connection limits
         self.async_client = httpx.AsyncClient(
             limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
-            timeout=10.0
+            timeout=10.0,
+            event_hooks={'request': [self._forward_correlation_id]}
         )
 
-    # Synchronous call - blocking, simple operation
-    def get_sensor_sync(self, sensor_id: str) -> Dict[str, Any]:
+    @staticmethod
+    async def _forward_correlation_id(request: httpx.Request):
+        # Propagate the current request's correlation ID to the sensor service
+        correlation_id = get_correlation_id()
+        if correlation_id:
+            request.headers['X-Correlation-ID'] = correlation_id
+
+    async def _request(self, endpoint: str, method: str, url: str, timeout: float, **kwargs) -> httpx.Response:
+        """
+        Send one request within the caller's deadline: the timeout shrinks to the time
+        left and the remaining budget is forwarded so the sensor service can stop early.
+        With hedging on, a second attempt starts once the first outlives the endpoint's p95.
+        """
+        latency = self.latencies.setdefault(endpoint, LatencyTracker())
+
+        async def attempt():
+            remaining = remaining_seconds()
+            if remaining is not None and remaining <= 0:
+                raise DeadlineExceeded(f"Deadline exceeded before {endpoint}")
+            budget = timeout if remaining is None else min(timeout, remaining)
+
+            started = time.monotonic()
+            try:
+                response = await self.async_client.request(
+                    method, url, timeout=budget,
+                    headers={DEADLINE_HEADER: str(max(1, int(budget * 1000)))},
+                    **kwargs
+                )
+            except httpx.TimeoutException:
+                if budget < timeout:
+                    raise DeadlineExceeded(f"Deadline exceeded waiting for {endpoint}")
+                raise
+            latency.record(time.monotonic() - started)
+            return response
+
+        if self.hedging_enabled:
+            p95 = latency.percentile(0.95)
+            remaining = remaining_seconds()
+            if p95 is not None:
+                delay = max(p95, self.hedge_min_delay)
+                # No point hedging when the budget ends before the second attempt would start
+                if remaining is None or remaining > delay:
+                    return await hedged(attempt, delay)
+        return await attempt()
+
+    async def _coalesced(self, key, fetch):
+        """
+        Run fetch once per key across concurrent callers. The shared request carries the
+        first caller's deadline; a follower with time left retries if that budget ran out.
+        """
+        leader = self.flights.is_leader(key)
         try:
-            response = self.sync_session.get(
-                f"{self.base_url}/sensors/{sensor_id}",
-                timeout=5
-            )
+            return await self.flights.do(key, fetch)
+        except DeadlineExceeded:
+            remaining = remaining_seconds()
+            if leader or (remaining is not None and remaining <= 0):
+                raise
+            return await self.flights.do(key, fetch)
+
+    # Single sensor lookup - awaited, so a slow sensor service never blocks the event loop
+    async def get_sensor(self, sensor_id: str) -> Optional[Dict[str, Any]]:
+        """Return the sensor, or None when it does not exist (a 404 is not a breaker failure)"""
+        async def fetch_sensor():
+            response = await self._request('GET /sensors/{id}', 'GET', f"{self.base_url}/sensors/{sensor_id}", 5.0)
+            if response.status_code == 404:
+                return None
             response.raise_for_status()
             return response.json()
+
+        try:
+            return await self._coalesced(
+                ('GET /sensors/{id}', sensor_id),
+                lambda: self.breakers.get('GET /sensors/{id}').call(fetch_sensor)
+            )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             raise Exception(f"Failed to fetch sensor {sensor_id}: {str(e)}")
-    
-    def __del__(self):
-        """Cleanup on deletion"""
-        if hasattr(self, 'sync_session'):
-            self.sync_session.close()
 
     # Asynchronous parallel calls - non-blocking, batch operations
     async def get_sensors_async(self, sensor_ids: List[str]) -> List[Dict[str, Any]]:
-        async def fetch_sensor(sensor_id):
+        """
+        Fetch many sensors through POST /sensors/lookup, one request per chunk of ids;
+        concurrent callers asking for the same ids share each chunk's request.
+        Returns one entry per requested id, in order; ids that were not found or whose
+        chunk failed come back as {"error": ..., "sensor_id": ...}.
+        """
+        async def fetch_chunk(chunk):
+            response = await self._request(
+                'POST /sensors/lookup', 'POST', f"{self.base_url}/sensors/lookup", 10.0, json={"sensor_ids": list(chunk)}
+            )
+            response.raise_for_status()
+            return response.json()
+
+        async def lookup_chunk(chunk):
             try:
-                response = await self.async_client.get(f"{self.base_url}/sensors/{sensor_id}")
-                response.raise_for_status()
-                return response.json()
+                # Inside the breaker, so chunk failures count; an open breaker fails fast
+                body = await self._coalesced(
+                    ('POST /sensors/lookup', chunk),
+                    lambda: self.breakers.get('POST /sensors/lookup').call(fetch_chunk, chunk)
+                )
+            except DeadlineExceeded:
+                # Partial results are useless once the caller has given up
+                raise
             except Exception as e:
-                return {"error": str(e), "sensor_id": sensor_id}
+                return {sensor_id: {"error": str(e), "sensor_id": sensor_id} for sensor_id in chunk}
+            return {sensor['sensor_id']: sensor for sensor in body.get('data', [])}
+
+        # Sorted so the same id set always yields the same chunks (and coalescing keys)
+        unique_ids = sorted(set(sensor_ids))
+        chunks = [
+            tuple(unique_ids[i:i + self.lookup_chunk_size])
+            for i in range(0, len(unique_ids), self.lookup_chunk_size)
+        ]
+
+        found = {}
+        for result in await asyncio.gather(*(lookup_chunk(chunk) for chunk in chunks)):
+            found.update(result)
 
-        tasks = [circuit_breaker.call(fetch_sensor, sensor_id) for sensor_id in sensor_ids]
-        return await asyncio.gather(*tasks)
+        return [
+            found.get(sensor_id, {"error": "Sensor not found", "sensor_id": sensor_id})
+            for sensor_id in sensor_ids
+        ]
 
     # Get all sensors
     async def get_all_sensors(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -98,11 +177,20 @@ class SensorClient:
             params['offset'] = filters['offset']
 
         async def fetch_all():
-            response = await self.async_client.get(f"{self.base_url}/sensors", params=params)
+            response = await self._request('GET /sensors', 'GET', f"{self.base_url}/sensors", 10.0, params=params)
             response.raise_for_status()
             return response.json()
 
-        return await circuit_breaker.call(fetch_all)
+        return await self._coalesced(
+            ('GET /sensors', tuple(sorted(params.items()))),
+            lambda: self.breakers.get('GET /sensors').call(fetch_all)
+        )
+
+    def get_circuit_stats(self) -> Dict[str, Dict[str, Any]]:
+        return self.breakers.get_stats()
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        return self.flights.get_stats()
 
     async def close(self):
         await self.async_client.aclose()
@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: the first caller for a key starts the work,
+    later callers await the same task until it finishes. Nothing is cached afterwards.
+
+    The task is shielded, so a caller that is cancelled (e.g. its deadline passed) does
+    not cancel the work for everyone else. Results are shared objects; callers must
+    treat them as read-only.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {'started': 0, 'coalesced': 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self._stats['started'] += 1
+        else:
+            self._stats['coalesced'] += 1
+        return await asyncio.shield(task)
+
+    def is_leader(self, key: Hashable) -> bool:
+        return key not in self._flights
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Mark the error as retrieved when every waiter has already gone away
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, 'in_flight': len(self._flights)}
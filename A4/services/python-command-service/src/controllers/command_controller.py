@@ -2,6 +2,7 @@ from typing import Optional, Dict, Any
 from fastapi import HTTPException, Query, Request
 from services.command_service import CommandService
 from services.logger import Logger
+from middleware.deadline import DeadlineExceeded
 
 
 class CommandController:
@@ -14,9 +15,6 @@ class CommandController:
         request: Request
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             dashboards = await self.service.get_all_dashboards()
             return {'data': dashboards, 'count': len(dashboards)}
         except Exception as e:
@@ -29,9 +27,6 @@ class CommandController:
         dashboard_id: str
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             return await self.service.get_dashboard_by_id(dashboard_id)
         except ValueError as e:
             if 'not found' in str(e):
@@ -47,9 +42,6 @@ class CommandController:
         dashboard_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             dashboard = await self.service.create_dashboard(dashboard_data)
             return dashboard
         except Exception as e:
@@ -62,22 +54,28 @@ class CommandController:
         acknowledged: Optional[bool] = Query(None),
         severity: Optional[str] = Query(None),
         limit: Optional[int] = Query(None),
-        offset: int = Query(0)
+        offset: int = Query(0),
+        cursor: Optional[str] = Query(None)
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             filters = {
                 'acknowledged': acknowledged,
                 'severity': severity,
                 'limit': limit,
-                'offset': offset
+                'offset': offset,
+                'cursor': cursor
             }
             filters = {k: v for k, v in filters.items() if v is not None}
 
+            # Keyset mode: a limited request without an offset gets a next_cursor
+            if limit and not offset:
+                page = await self.service.get_alerts_page(filters)
+                return {'data': page['data'], 'count': len(page['data']), 'next_cursor': page['next_cursor']}
+
             alerts = await self.service.get_all_alerts(filters)
             return {'data': alerts, 'count': len(alerts)}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             self.logger.error('Error fetching alerts', {'error': str(e)})
             raise HTTPException(status_code=500, detail='Internal server error')
@@ -88,15 +86,16 @@ class CommandController:
         alert_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             alert = await self.service.create_alert(alert_data)
             return alert
         except ValueError as e:
             if 'not found' in str(e):
                 raise HTTPException(status_code=404, detail=str(e))
+            if 'unavailable' in str(e):
+                raise HTTPException(status_code=503, detail=str(e))
             raise HTTPException(status_code=400, detail=str(e))
+        except DeadlineExceeded as e:
+            raise HTTPException(status_code=504, detail=str(e))
         except Exception as e:
             self.logger.error('Error creating alert', {'error': str(e)})
             raise HTTPException(status_code=400, detail=str(e))
@@ -107,9 +106,6 @@ class CommandController:
         alert_id: str
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             return await self.service.acknowledge_alert(alert_id)
         except ValueError as e:
             if 'not found' in str(e):
@@ -126,9 +122,6 @@ class CommandController:
         sensor_ids: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             ids = sensor_ids.get('sensor_ids', [])
             if not ids:
                 raise HTTPException(status_code=400, detail='sensor_ids array is required')
@@ -137,6 +130,8 @@ class CommandController:
             return summary
         except HTTPException:
             raise
+        except DeadlineExceeded as e:
+            raise HTTPException(status_code=504, detail=str(e))
         except Exception as e:
             self.logger.error('Error aggregating sensors', {'error': str(e)})
             raise HTTPException(status_code=500, detail='Internal server error')
@@ -148,11 +143,10 @@ class CommandController:
         mission_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             dashboard = await self.service.create_mission_plan(mission_data)
             return dashboard
+        except DeadlineExceeded as e:
+            raise HTTPException(status_code=504, detail=str(e))
         except Exception as e:
             self.logger.error('Error creating mission plan', {'error': str(e)})
             raise HTTPException(status_code=500, detail='Internal server error')
@@ -164,9 +158,6 @@ class CommandController:
         sensor_ids: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             ids = sensor_ids.get('sensor_ids', [])
             if not ids:
                 raise HTTPException(status_code=400, detail='sensor_ids array is required')
@@ -175,6 +166,8 @@ class CommandController:
             return assessment
         except HTTPException:
             raise
+        except DeadlineExceeded as e:
+            raise HTTPException(status_code=504, detail=str(e))
         except Exception as e:
             self.logger.error('Error assessing threats', {'error': str(e)})
             raise HTTPException(status_code=500, detail='Internal server error')
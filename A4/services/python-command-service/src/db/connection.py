@@ -42,6 +42,21 @@ async def initialize_database():
             migration2 = f.read()
             async with pool.acquire() as conn:
                 await conn.execute(migration2)
+
+        with open(os.path.join(migrations_dir, '003_add_keyset_indexes.sql'), 'r') as f:
+            migration3 = f.read()
+            async with pool.acquire() as conn:
+                await conn.execute(migration3)
+
+        with open(os.path.join(migrations_dir, '004_add_active_dashboards_index.sql'), 'r') as f:
+            migration4 = f.read()
+            async with pool.acquire() as conn:
+                await conn.execute(migration4)
+
+        with open(os.path.join(migrations_dir, '005_create_rate_limit_buckets.sql'), 'r') as f:
+            migration5 = f.read()
+            async with pool.acquire() as conn:
+                await conn.execute(migration5)
         
         print('Command service database initialized successfully')
     except Exception as error:
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 from config.config import Config
 from services.logger import Logger
 from repositories.dashboard_repository import DashboardRepository
@@ -14,37 +15,67 @@ def get_config() -> Config:
     return Config()
 
 
+@lru_cache()
 def get_logger() -> Logger:
     config = get_config()
     return Logger(config)
 
 
+class Container:
+    """Application-scoped object graph: built once per process, shared by every request"""
+
+    def __init__(self, pool):
+        self.logger = get_logger()
+        self.dashboard_repository = DashboardRepository(pool)
+        self.alert_repository = AlertRepository(pool)
+        # One client per process keeps the httpx connection pool (and its keep-alives) warm
+        self.sensor_client = SensorClient()
+        self.command_service = CommandService(
+            self.dashboard_repository, self.alert_repository, self.sensor_client, self.logger
+        )
+        self.command_controller = CommandController(self.command_service, self.logger)
+
+    async def close(self):
+        await self.sensor_client.close()
+
+
+_container: Optional[Container] = None
+
+
+async def get_container() -> Container:
+    """Return the container, building it on first use if startup could not (e.g. database was down)"""
+    global _container
+    if _container is None:
+        pool = await get_pool()
+        _container = Container(pool)
+    return _container
+
+
+async def close_container():
+    global _container
+    if _container:
+        await _container.close()
+        _container = None
+
+
 async def get_dashboard_repository() -> DashboardRepository:
-    pool = await get_pool()
-    return DashboardRepository(pool)
+    return (await get_container()).dashboard_repository
 
 
 async def get_alert_repository() -> AlertRepository:
-    pool = await get_pool()
-    return AlertRepository(pool)
+    return (await get_container()).alert_repository
 
 
-def get_sensor_client() -> SensorClient:
-    return SensorClient()
+async def get_sensor_client() -> SensorClient:
+    return (await get_container()).sensor_client
 
 
 async def get_command_service() -> CommandService:
-    dashboard_repo = await get_dashboard_repository()
-    alert_repo = await get_alert_repository()
-    sensor_client = get_sensor_client()
-    logger = get_logger()
-    return CommandService(dashboard_repo, alert_repo, sensor_client, logger)
+    return (await get_container()).command_service
 
 
 async def get_command_controller() -> CommandController:
-    service = await get_command_service()
-    logger = get_logger()
-    return CommandController(service, logger)
+    return (await get_container()).command_controller
 
 
 def get_api_key() -> str:
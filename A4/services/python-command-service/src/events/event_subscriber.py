@@ -1,58 +1,81 @@
-import pika
+import asyncio
 import json
-from typing import Dict, Any
-from config.config import Config
-from events.rabbitmq_client import get_connection, get_channel
+from typing import Dict, Any, Optional
+from events.rabbitmq_client import get_connection, declare_exchanges
 
 
 class EventSubscriber:
-    def __init__(self, dashboard_repository, alert_repository, logger):
+    def __init__(
+        self,
+        dashboard_repository,
+        alert_repository,
+        logger,
+        prefetch_count: int = 32,
+        max_concurrency: int = 16,
+        queue_name: str = 'command.sensor.events'
+    ):
         self.dashboard_repository = dashboard_repository
         self.alert_repository = alert_repository
         self.logger = logger
+        self.prefetch_count = prefetch_count
+        self.queue_name = queue_name
         self.queues = []
+        # Caps in-flight handlers independently of how many messages the broker pushes
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._channel = None
+        self._queue = None
+        self._consumer_tag: Optional[str] = None
 
-    def start(self):
-        """Start consuming events from RabbitMQ"""
-        try:
-            channel = get_channel()
+    async def start(self):
+        """Start consuming events from RabbitMQ on the running event loop"""
+        connection = await get_connection()
 
-            # Create queue
-            queue_result = channel.queue_declare(queue='command.sensor.events', durable=True)
-            queue_name = queue_result.method.queue
+        # Dedicated consumer channel; prefetch bounds unacked messages in flight
+        self._channel = await connection.channel()
+        await self._channel.set_qos(prefetch_count=self.prefetch_count)
+        await declare_exchanges(self._channel)
 
-            # Bind to sensor events
-            channel.queue_bind(
-                exchange='sensor.events',
-                queue=queue_name,
-                routing_key='sensor.*'
-            )
+        # Create queue and bind to sensor events
+        self._queue = await self._channel.declare_queue(self.queue_name, durable=True)
+        await self._queue.bind('sensor.events', routing_key='sensor.*')
 
-            # Set up consumer
-            channel.basic_consume(
-                queue=queue_name,
-                on_message_callback=self._handle_message,
-                auto_ack=False
-            )
+        # Each delivery runs as its own task, so up to prefetch_count handlers overlap
+        self._consumer_tag = await self._queue.consume(self._handle_message, no_ack=False)
 
-            self.queues.append(queue_name)
-            self.logger.info('Event subscriber started', {'queues': self.queues})
+        self.queues.append(self.queue_name)
+        self.logger.info('Event subscriber started', {
+            'queues': self.queues,
+            'prefetch_count': self.prefetch_count
+        })
 
-            # Start consuming (blocking)
-            channel.start_consuming()
-        except Exception as error:
-            self.logger.error('Failed to start event subscriber', {'error': str(error)})
+    async def run(self, retry_delay: float = 5.0):
+        """Start the subscriber, retrying until the broker is reachable"""
+        while True:
+            try:
+                await self.start()
+                return
+            except Exception as error:
+                self.logger.error('Failed to start event subscriber', {'error': str(error)})
+                await asyncio.sleep(retry_delay)
 
-    def _handle_message(self, ch, method, properties, body):
+    async def stop(self):
+        if self._queue and self._consumer_tag:
+            await self._queue.cancel(self._consumer_tag)
+            self._consumer_tag = None
+        if self._channel and not self._channel.is_closed:
+            await self._channel.close()
+            self._channel = None
+
+    async def _handle_message(self, message):
         """Handle incoming message"""
-        try:
-            event = json.loads(body)
-            import asyncio
-            asyncio.run(self.handle_sensor_event(event))
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-        except Exception as error:
-            self.logger.error('Error processing sensor event', {'error': str(error)})
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        async with self._semaphore:
+            try:
+                event = json.loads(message.body)
+                await self.handle_sensor_event(event)
+                await message.ack()
+            except Exception as error:
+                self.logger.error('Error processing sensor event', {'error': str(error)})
+                await message.nack(requeue=False)
 
     async def handle_sensor_event(self, event: Dict[str, Any]):
         """Process sensor event"""
@@ -60,15 +83,10 @@ class EventSubscriber:
 
         event_type = event.get('event_type')
         if event_type in ['sensor.created', 'sensor.updated']:
-            # Update dashboards with new sensor data
-            dashboards = await self.dashboard_repository.find_all()
-            for dashboard in dashboards:
-                if dashboard['status'] == 'active':
-                    summary = dashboard.get('sensor_summary', {})
-                    summary[event['data']['sensor_id']] = event['data']
-                    await self.dashboard_repository.update(dashboard['dashboard_id'], {
-                        'sensor_summary': summary
-                    })
+            # Merge the sensor into every active dashboard's summary in a single statement
+            await self.dashboard_repository.merge_sensor_into_active(
+                event['data']['sensor_id'], event['data']
+            )
         elif event_type == 'sensor.alert':
             # Create alert from sensor alert event
             alert = {
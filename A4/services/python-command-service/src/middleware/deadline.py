@@ -0,0 +1,74 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Remaining budget in milliseconds; relative, so caller and callee clocks never need to agree
+DEADLINE_HEADER = 'X-Request-Timeout-Ms'
+
+# Request-scoped absolute deadline on time.monotonic()
+deadline_var: ContextVar[Optional[float]] = ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The caller's time budget ran out before the work could finish"""
+
+
+def remaining_seconds() -> Optional[float]:
+    """Seconds left for the current request, or None when it has no deadline"""
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+class DeadlineMiddleware:
+    """
+    Pure ASGI: reads the caller's budget from X-Request-Timeout-Ms (or default_timeout_ms)
+    and stops the request with 504 once it is spent. Cancelling the handler also cancels
+    any database query or downstream call it is awaiting.
+    """
+
+    def __init__(self, app: ASGIApp, default_timeout_ms: int = 0):
+        self.app = app
+        self.default_timeout_ms = default_timeout_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            timeout_ms = int(Headers(scope=scope).get(DEADLINE_HEADER.lower(), self.default_timeout_ms))
+        except ValueError:
+            timeout_ms = self.default_timeout_ms
+        if timeout_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = time.monotonic() + timeout_ms / 1000
+        response_started = False
+
+        async def send_tracking_start(message: Message):
+            nonlocal response_started
+            if message['type'] == 'http.response.start':
+                response_started = True
+            await send(message)
+
+        token = deadline_var.set(deadline)
+        try:
+            await asyncio.wait_for(self.app(scope, receive, send_tracking_start), timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            # A TimeoutError raised by the handler itself before the deadline is not ours to answer
+            if time.monotonic() < deadline:
+                raise
+            # Too late for a status code: a streamed body simply ends at the deadline
+            if response_started:
+                return
+            response = JSONResponse({'detail': 'Deadline exceeded'}, status_code=504)
+            await response(scope, receive, send)
+        finally:
+            deadline_var.reset(token)
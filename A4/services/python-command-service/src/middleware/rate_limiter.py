@@ -1,43 +1,166 @@
+import hashlib
+import hmac
+import ipaddress
+import math
 import time
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from collections import OrderedDict
+from typing import Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from config.config import Config
 
 
-# Rate Limiter implementation (Token Bucket Algorithm)
-class RateLimiter:
-    def __init__(self, rate: float, capacity: int):
-        self.rate = rate  # tokens per second
-        self.capacity = capacity  # max tokens
-        self.tokens = capacity
-        self.last_check = time.time()
+# Rate Limiter implementation (Token Bucket Algorithm), one bucket per client key
+class MemoryRateLimitBackend:
+    """
+    Per-process buckets. Everything runs on the event loop thread, so no lock is needed.
+    Idle buckets are evicted least-recently-used once max_keys is reached.
+    """
 
-    def allow_request(self) -> bool:
-        now = time.time()
-        elapsed = now - self.last_check
-        self.last_check = now
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> Tuple[bool, float]:
+        """Take one token; returns (allowed, seconds until a token is available)"""
+        now = time.monotonic()
+        tokens, last_check = self._buckets.pop(key, (capacity, now))
 
         # Add tokens based on elapsed time
-        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        tokens = min(capacity, tokens + (now - last_check) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+class PostgresRateLimitBackend:
+    """
+    Buckets shared by every worker and replica: one atomic upsert per request on
+    rate_limit_buckets. Refill uses the database clock, so replicas never disagree.
+    """
+
+    ACQUIRE_SQL = '''
+        INSERT INTO rate_limit_buckets AS b (bucket_key, tokens, allowed, refreshed_at)
+        VALUES ($1, $3 - 1, TRUE, now())
+        ON CONFLICT (bucket_key) DO UPDATE SET
+            tokens = CASE
+                WHEN LEAST($3, b.tokens + EXTRACT(EPOCH FROM now() - b.refreshed_at) * $2) >= 1
+                THEN LEAST($3, b.tokens + EXTRACT(EPOCH FROM now() - b.refreshed_at) * $2) - 1
+                ELSE LEAST($3, b.tokens + EXTRACT(EPOCH FROM now() - b.refreshed_at) * $2)
+            END,
+            allowed = LEAST($3, b.tokens + EXTRACT(EPOCH FROM now() - b.refreshed_at) * $2) >= 1,
+            refreshed_at = now()
+        RETURNING allowed, tokens
+    '''
+
+    PRUNE_SQL = "DELETE FROM rate_limit_buckets WHERE refreshed_at < now() - INTERVAL '1 hour'"
+
+    def __init__(self, pool_getter, prune_every: int = 10000):
+        self._get_pool = pool_getter
+        self._prune_every = prune_every
+        self._calls = 0
+
+    async def acquire(self, key: str, rate: float, capacity: int) -> Tuple[bool, float]:
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(self.ACQUIRE_SQL, key, float(rate), float(capacity))
+
+            # Idle buckets are full again after an hour; dropping them loses nothing
+            self._calls += 1
+            if self._calls % self._prune_every == 0:
+                await conn.execute(self.PRUNE_SQL)
+        if row['allowed']:
+            return True, 0.0
+        return False, (1 - row['tokens']) / rate
 
-        if self.tokens >= 1:
-            self.tokens -= 1
-            return True
-        return False
 
+def create_backend(config: Config):
+    if config.get_rate_limit_backend() == 'postgres':
+        from db.connection import get_pool
+        return PostgresRateLimitBackend(get_pool)
+    return MemoryRateLimitBackend()
 
-# Create rate limiters for different endpoints
-general_limiter = RateLimiter(100.0, 200)  # 100 req/sec, burst 200
-write_limiter = RateLimiter(50.0, 100)  # 50 req/sec, burst 100
 
+def _parse_ip(value: Optional[str]) -> Optional[str]:
+    """Normalized address from a proxy header, or None when it is not an IP (keeps bucket keys short)"""
+    if not value:
+        return None
+    try:
+        address = ipaddress.ip_address(value.strip())
+    except ValueError:
+        return None
+    # A scope id ("fe80::1%eth0") is free text of any length; proxies never send one
+    if getattr(address, 'scope_id', None):
+        return None
+    return str(address)
+
+
+class RateLimiterMiddleware:
+    """
+    Pure ASGI: rejected requests are answered here with 429 and Retry-After.
+    Buckets are keyed by API key when the valid one is sent, otherwise by client IP.
+    """
+
+    def __init__(self, app: ASGIApp, backend=None, config: Optional[Config] = None):
+        self.app = app
+        config = config or Config()
+        self.backend = backend or create_backend(config)
+        self.general_limit = (config.get_rate_limit_rate(), config.get_rate_limit_burst())
+        self.write_limit = (config.get_rate_limit_write_rate(), config.get_rate_limit_write_burst())
+        self.trust_proxy = config.get_rate_limit_trust_proxy()
+        self.api_key = config.get_api_key()
+        # Hashed so the raw API key never sits in memory maps or the shared store
+        self.api_key_bucket = 'key:' + hashlib.sha256(self.api_key.encode()).hexdigest()[:32]
+
+    def _client_key(self, scope: Scope) -> str:
+        headers = Headers(scope=scope)
+        authorization = headers.get('authorization', '')
+        if authorization.lower().startswith('bearer '):
+            # Auth has not run yet: an unchecked token would let every request mint a fresh bucket
+            if hmac.compare_digest(authorization[7:].encode(), self.api_key.encode()):
+                return self.api_key_bucket
+
+        if self.trust_proxy:
+            forwarded = (
+                _parse_ip(headers.get('x-real-ip'))
+                or _parse_ip(headers.get('x-forwarded-for', '').split(',')[0])
+            )
+            if forwarded:
+                return f'ip:{forwarded}'
+        client = scope.get('client')
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-class RateLimiterMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
         # Use stricter limits for write operations
-        is_write_operation = request.method in ['POST', 'PATCH', 'PUT', 'DELETE']
-        limiter = write_limiter if is_write_operation else general_limiter
-
-        if limiter.allow_request():
-            response = await call_next(request)
-            return response
-        else:
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
+        is_write_operation = scope['method'] in ['POST', 'PATCH', 'PUT', 'DELETE']
+        rate, capacity = self.write_limit if is_write_operation else self.general_limit
+        key = f"{'write' if is_write_operation else 'read'}:{self._client_key(scope)}"
+
+        try:
+            allowed, retry_after = await self.backend.acquire(key, rate, capacity)
+        except Exception as error:
+            # Fail open: a shared-store outage must not take the API down with it
+            print(f'Rate limiter backend unavailable: {error}')
+            allowed, retry_after = True, 0.0
+
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        response = JSONResponse(
+            {'detail': 'Rate limit exceeded'},
+            status_code=429,
+            headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+        )
+        await response(scope, receive, send)
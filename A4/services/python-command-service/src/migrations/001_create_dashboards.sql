@@ -24,6 +24,7 @@ CREATE INDEX IF NOT EXISTS idx_dashboards_mission_id ON tactical_dashboards(miss
 -- Create index on threat_level
 CREATE INDEX IF NOT EXISTS idx_dashboards_threat_level ON tactical_dashboards(threat_level);
 
--- Create trigger to auto-update updated_at
+-- Create trigger to auto-update updated_at (dropped first so startup migrations are re-runnable)
+DROP TRIGGER IF EXISTS update_dashboards_updated_at ON tactical_dashboards;
 CREATE TRIGGER update_dashboards_updated_at BEFORE UPDATE ON tactical_dashboards
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,5 @@
+-- Composite index matching the (created_at, alert_id) keyset used by cursor pagination
+CREATE INDEX IF NOT EXISTS idx_alerts_created_at_alert_id ON alerts(created_at, alert_id);
+
+-- Composite index for the mission UI poll (acknowledged=false, newest first)
+CREATE INDEX IF NOT EXISTS idx_alerts_acknowledged_created_at_alert_id ON alerts(acknowledged, created_at, alert_id);
@@ -0,0 +1,2 @@
+-- Partial index for the per-event sensor merge, which only touches active dashboards
+CREATE INDEX IF NOT EXISTS idx_dashboards_active ON tactical_dashboards(dashboard_id) WHERE status = 'active';
@@ -0,0 +1,11 @@
+-- Token buckets shared by every command-service worker and replica (RATE_LIMIT_BACKEND=postgres).
+-- Unlogged: bucket state is disposable, so skip WAL on this hot, write-per-request table.
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_buckets (
+    bucket_key TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    allowed BOOLEAN NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL
+);
+
+-- Supports pruning idle buckets
+CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_refreshed_at ON rate_limit_buckets(refreshed_at);
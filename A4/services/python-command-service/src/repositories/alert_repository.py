@@ -1,4 +1,37 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+import base64
+import json
+
+
+def encode_cursor(created_at: datetime, alert_id: str) -> str:
+    """Opaque keyset cursor for the (created_at, alert_id) sort key"""
+    raw = json.dumps([created_at.isoformat(), alert_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, alert_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(alert_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+ALERT_COLUMNS = ['alert_id', 'sensor_id', 'alert_type', 'severity', 'message', 'acknowledged', 'created_at']
+ALERT_SELECT = ', '.join(ALERT_COLUMNS)
+
+
+def _to_dict(row) -> Dict[str, Any]:
+    return {
+        'alert_id': row['alert_id'],
+        'sensor_id': row['sensor_id'],
+        'alert_type': row['alert_type'],
+        'severity': row['severity'],
+        'message': row['message'],
+        'acknowledged': row['acknowledged'],
+        'created_at': row['created_at'].isoformat() + 'Z'
+    }
 
 
 class AlertRepository:
@@ -6,8 +39,26 @@ class AlertRepository:
         self._pool = pool
 
     async def find_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        filters = filters or {}
-        query = 'SELECT * FROM alerts WHERE 1=1'
+        rows = await self._fetch(filters or {})
+        return [_to_dict(row) for row in rows]
+
+    async def find_page(self, filters: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Keyset pagination on (created_at, alert_id), newest first.
+        Fetches one extra row to know whether another page exists.
+        """
+        limit = filters['limit']
+        rows = await self._fetch({**filters, 'limit': limit + 1})
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last['created_at'], last['alert_id'])
+
+        return [_to_dict(row) for row in rows[:limit]], next_cursor
+
+    async def _fetch(self, filters: Dict[str, Any]):
+        query = f'SELECT {ALERT_SELECT} FROM alerts WHERE 1=1'
         params = []
         param_count = 1
 
@@ -19,8 +70,16 @@ class AlertRepository:
             query += f' AND severity = ${param_count}'
             params.append(filters['severity'])
             param_count += 1
+        if filters.get('cursor'):
+            if filters.get('offset'):
+                raise ValueError('cursor and offset cannot be combined')
+            before_created_at, before_id = decode_cursor(filters['cursor'])
+            query += f' AND (created_at, alert_id) < (${param_count}, ${param_count + 1})'
+            params.extend([before_created_at, before_id])
+            param_count += 2
 
-        query += ' ORDER BY created_at DESC'
+        # alert_id breaks ties so pages are stable across requests
+        query += ' ORDER BY created_at DESC, alert_id DESC'
 
         if 'limit' in filters:
             query += f' LIMIT ${param_count}'
@@ -32,46 +91,26 @@ class AlertRepository:
                 param_count += 1
 
         async with self._pool.acquire() as conn:
-            rows = await conn.fetch(query, *params)
-            return [
-                {
-                    'alert_id': row['alert_id'],
-                    'sensor_id': row['sensor_id'],
-                    'alert_type': row['alert_type'],
-                    'severity': row['severity'],
-                    'message': row['message'],
-                    'acknowledged': row['acknowledged'],
-                    'created_at': row['created_at'].isoformat() + 'Z'
-                }
-                for row in rows
-            ]
+            return await conn.fetch(query, *params)
 
     async def find_by_id(self, alert_id: str) -> Optional[Dict[str, Any]]:
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                'SELECT * FROM alerts WHERE alert_id = $1',
+                f'SELECT {ALERT_SELECT} FROM alerts WHERE alert_id = $1',
                 alert_id
             )
             
             if not row:
                 return None
             
-            return {
-                'alert_id': row['alert_id'],
-                'sensor_id': row['sensor_id'],
-                'alert_type': row['alert_type'],
-                'severity': row['severity'],
-                'message': row['message'],
-                'acknowledged': row['acknowledged'],
-                'created_at': row['created_at'].isoformat() + 'Z'
-            }
+            return _to_dict(row)
 
     async def create(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                '''INSERT INTO alerts (alert_id, sensor_id, alert_type, severity, message)
+                f'''INSERT INTO alerts (alert_id, sensor_id, alert_type, severity, message)
                    VALUES ($1, $2, $3, $4, $5)
-                   RETURNING *''',
+                   RETURNING {ALERT_SELECT}''',
                 alert_data['alert_id'],
                 alert_data['sensor_id'],
                 alert_data['alert_type'],
@@ -79,32 +118,16 @@ class AlertRepository:
                 alert_data['message']
             )
             
-            return {
-                'alert_id': row['alert_id'],
-                'sensor_id': row['sensor_id'],
-                'alert_type': row['alert_type'],
-                'severity': row['severity'],
-                'message': row['message'],
-                'acknowledged': row['acknowledged'],
-                'created_at': row['created_at'].isoformat() + 'Z'
-            }
+            return _to_dict(row)
 
     async def acknowledge(self, alert_id: str) -> Optional[Dict[str, Any]]:
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                'UPDATE alerts SET acknowledged = TRUE WHERE alert_id = $1 RETURNING *',
+                f'UPDATE alerts SET acknowledged = TRUE WHERE alert_id = $1 RETURNING {ALERT_SELECT}',
                 alert_id
             )
             
             if not row:
                 return None
             
-            return {
-                'alert_id': row['alert_id'],
-                'sensor_id': row['sensor_id'],
-                'alert_type': row['alert_type'],
-                'severity': row['severity'],
-                'message': row['message'],
-                'acknowledged': row['acknowledged'],
-                'created_at': row['created_at'].isoformat() + 'Z'
-            }
+            return _to_dict(row)
@@ -1,6 +1,23 @@
 from typing import Dict, List, Optional, Any
 import json
 
+DASHBOARD_COLUMNS = [
+    'dashboard_id', 'mission_id', 'sensor_summary', 'threat_level', 'status', 'created_at', 'updated_at'
+]
+DASHBOARD_SELECT = ', '.join(DASHBOARD_COLUMNS)
+
+
+def _to_dict(row) -> Dict[str, Any]:
+    return {
+        'dashboard_id': row['dashboard_id'],
+        'mission_id': row['mission_id'],
+        'sensor_summary': row['sensor_summary'],
+        'threat_level': row['threat_level'],
+        'status': row['status'],
+        'created_at': row['created_at'].isoformat() + 'Z',
+        'updated_at': row['updated_at'].isoformat() + 'Z'
+    }
+
 
 class DashboardRepository:
     def __init__(self, pool):
@@ -8,46 +25,27 @@ class DashboardRepository:
 
     async def find_all(self) -> List[Dict[str, Any]]:
         async with self._pool.acquire() as conn:
-            rows = await conn.fetch('SELECT * FROM tactical_dashboards ORDER BY created_at DESC')
-            return [
-                {
-                    'dashboard_id': row['dashboard_id'],
-                    'mission_id': row['mission_id'],
-                    'sensor_summary': row['sensor_summary'],
-                    'threat_level': row['threat_level'],
-                    'status': row['status'],
-                    'created_at': row['created_at'].isoformat() + 'Z',
-                    'updated_at': row['updated_at'].isoformat() + 'Z'
-                }
-                for row in rows
-            ]
+            rows = await conn.fetch(f'SELECT {DASHBOARD_SELECT} FROM tactical_dashboards ORDER BY created_at DESC')
+            return [_to_dict(row) for row in rows]
 
     async def find_by_id(self, dashboard_id: str) -> Optional[Dict[str, Any]]:
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                'SELECT * FROM tactical_dashboards WHERE dashboard_id = $1',
+                f'SELECT {DASHBOARD_SELECT} FROM tactical_dashboards WHERE dashboard_id = $1',
                 dashboard_id
             )
             
             if not row:
                 return None
             
-            return {
-                'dashboard_id': row['dashboard_id'],
-                'mission_id': row['mission_id'],
-                'sensor_summary': row['sensor_summary'],
-                'threat_level': row['threat_level'],
-                'status': row['status'],
-                'created_at': row['created_at'].isoformat() + 'Z',
-                'updated_at': row['updated_at'].isoformat() + 'Z'
-            }
+            return _to_dict(row)
 
     async def create(self, dashboard_data: Dict[str, Any]) -> Dict[str, Any]:
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                '''INSERT INTO tactical_dashboards (dashboard_id, mission_id, sensor_summary, threat_level, status)
+                f'''INSERT INTO tactical_dashboards (dashboard_id, mission_id, sensor_summary, threat_level, status)
                    VALUES ($1, $2, $3, $4, $5)
-                   RETURNING *''',
+                   RETURNING {DASHBOARD_SELECT}''',
                 dashboard_data['dashboard_id'],
                 dashboard_data['mission_id'],
                 json.dumps(dashboard_data['sensor_summary']),
@@ -55,15 +53,7 @@ class DashboardRepository:
                 dashboard_data['status']
             )
             
-            return {
-                'dashboard_id': row['dashboard_id'],
-                'mission_id': row['mission_id'],
-                'sensor_summary': row['sensor_summary'],
-                'threat_level': row['threat_level'],
-                'status': row['status'],
-                'created_at': row['created_at'].isoformat() + 'Z',
-                'updated_at': row['updated_at'].isoformat() + 'Z'
-            }
+            return _to_dict(row)
 
     async def update(self, dashboard_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         fields = []
@@ -90,16 +80,25 @@ class DashboardRepository:
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
                 f'''UPDATE tactical_dashboards SET {', '.join(fields)} 
-                    WHERE dashboard_id = ${param_count} RETURNING *''',
+                    WHERE dashboard_id = ${param_count} RETURNING {DASHBOARD_SELECT}''',
                 *values
             )
             
-            return {
-                'dashboard_id': row['dashboard_id'],
-                'mission_id': row['mission_id'],
-                'sensor_summary': row['sensor_summary'],
-                'threat_level': row['threat_level'],
-                'status': row['status'],
-                'created_at': row['created_at'].isoformat() + 'Z',
-                'updated_at': row['updated_at'].isoformat() + 'Z'
-            }
+            return _to_dict(row)
+
+    async def merge_sensor_into_active(self, sensor_id: str, sensor_data: Dict[str, Any]) -> int:
+        """
+        Set sensor_summary[sensor_id] on every active dashboard in one statement.
+        No read, no per-dashboard round-trip and no re-serialization of whole
+        summaries in Python. Returns the number of dashboards updated.
+        """
+        async with self._pool.acquire() as conn:
+            status = await conn.execute(
+                '''UPDATE tactical_dashboards
+                   SET sensor_summary = jsonb_set(sensor_summary, $1::text[], $2::jsonb, true)
+                   WHERE status = 'active' ''',
+                [sensor_id],
+                json.dumps(sensor_data)
+            )
+            # Command tag is 'UPDATE <rows>'
+            return int(status.split()[-1])
@@ -40,9 +40,10 @@ async def get_all_alerts(
     severity: str = None,
     limit: int = None,
     offset: int = 0,
+    cursor: str = None,
     controller: CommandController = Depends(get_command_controller)
 ):
-    return await controller.get_all_alerts(request, acknowledged, severity, limit, offset)
+    return await controller.get_all_alerts(request, acknowledged, severity, limit, offset, cursor)
 
 
 @router.post("/alerts")
@@ -1,6 +1,7 @@
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import uuid
+from middleware.deadline import DeadlineExceeded
 
 
 class CommandService:
@@ -35,15 +36,19 @@ class CommandService:
 
         return await self.dashboard_repository.create(dashboard)
 
-    # Synchronous: Fetch single sensor for validation
+    # Asynchronous: Fetch single sensor for validation
     async def create_alert(self, alert_data: Dict[str, Any]) -> Dict[str, Any]:
         alert_id = alert_data.get('alert_id') or f"alert_{uuid.uuid4()}"
         self.logger.info('Creating alert', {'alert_id': alert_id})
 
-        # Sync call to validate sensor exists
+        # Async call (behind the circuit breaker) to validate sensor exists
         try:
-            self.sensor_client.get_sensor_sync(alert_data['sensor_id'])
+            sensor = await self.sensor_client.get_sensor(alert_data['sensor_id'])
+        except DeadlineExceeded:
+            raise
         except Exception as e:
+            raise ValueError(f"Sensor service unavailable: {str(e)}")
+        if not sensor:
             raise ValueError(f"Sensor {alert_data['sensor_id']} not found")
 
         alert = {
@@ -61,6 +66,11 @@ class CommandService:
         self.logger.info('Fetching all alerts', {'filters': filters})
         return await self.alert_repository.find_all(filters)
 
+    async def get_alerts_page(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        self.logger.info('Fetching alert page', {'filters': filters})
+        alerts, next_cursor = await self.alert_repository.find_page(filters)
+        return {'data': alerts, 'next_cursor': next_cursor}
+
     async def acknowledge_alert(self, alert_id: str) -> Dict[str, Any]:
         self.logger.info('Acknowledging alert', {'alert_id': alert_id})
         alert = await self.alert_repository.acknowledge(alert_id)
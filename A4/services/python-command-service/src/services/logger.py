@@ -1,13 +1,100 @@
-import json
+import atexit
 import logging
-from typing import Optional, Dict, Any
+import queue
+import sys
+import threading
+import orjson
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+from middleware.correlation_id import correlation_id_var
+
+LEVELS = {'error': 0, 'warn': 1, 'info': 2, 'debug': 3}
+
+_STOP = object()
+
+
+class AsyncLogWriter:
+    """
+    Background log writer. Callers only enqueue a serialized line; a daemon thread
+    drains the bounded queue and writes whole batches to stdout with a single flush.
+    When the queue is full, lines are dropped (and counted) unless block_when_full is set.
+    """
+
+    def __init__(self, queue_size: int = 10000, batch_size: int = 256, block_when_full: bool = False):
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._block_when_full = block_when_full
+        self._stats = {'written': 0, 'dropped': 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, line: bytes):
+        if self._block_when_full:
+            self._queue.put(line)
+            return
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self._stats['dropped'] += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [line for line in batch if line is not _STOP]
+            if lines:
+                self._flush(lines)
+            if len(lines) != len(batch):
+                return
+
+    def _flush(self, lines: List[bytes]):
+        try:
+            # Resolved per batch so redirected stdout is honoured
+            sys.stdout.write(b''.join(lines).decode('utf-8'))
+            sys.stdout.flush()
+            self._stats['written'] += len(lines)
+        except Exception:
+            self._stats['dropped'] += len(lines)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self._stats, 'queued': self._queue.qsize()}
+
+    def close(self, timeout: float = 5.0):
+        """Write out everything queued so far and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+
+_writer: Optional[AsyncLogWriter] = None
+
+
+def get_log_writer(config) -> AsyncLogWriter:
+    global _writer
+    if _writer is None:
+        _writer = AsyncLogWriter(
+            config.get_log_queue_size(),
+            config.get_log_batch_size(),
+            config.get_log_queue_policy() == 'block'
+        )
+    return _writer
 
 
 class Logger:
     def __init__(self, config):
         self.config = config
-        self.correlation_id: Optional[str] = None
+        # Level threshold is fixed for the process; computed once instead of per call
+        self._threshold = LEVELS.get(config.get_log_level().lower(), 2)
+        self._writer = get_log_writer(config)
         self._setup_logging()
 
     def _setup_logging(self):
@@ -17,10 +104,20 @@ class Logger:
             format='%(message)s'
         )
 
+    @property
+    def correlation_id(self) -> Optional[str]:
+        # Set once per request by CorrelationIdMiddleware; one Logger serves every request
+        return correlation_id_var.get()
+
     def set_correlation_id(self, correlation_id: str):
-        self.correlation_id = correlation_id
+        """Bind a correlation id outside HTTP requests (e.g. while handling an event)"""
+        correlation_id_var.set(correlation_id)
 
     def _log(self, level: str, message: str, metadata: Optional[Dict[str, Any]] = None):
+        # Check if we should log before doing any work for the entry
+        if LEVELS.get(level, 2) > self._threshold:
+            return
+
         log_entry = {
             'timestamp': datetime.utcnow().isoformat() + 'Z',
             'level': level,
@@ -28,20 +125,22 @@ class Logger:
             'service': 'python-sensor-service',
         }
 
-        if self.correlation_id:
-            log_entry['correlationId'] = self.correlation_id
+        correlation_id = correlation_id_var.get()
+        if correlation_id:
+            log_entry['correlationId'] = correlation_id
 
         if metadata:
             log_entry.update(metadata)
 
-        # Check if we should log based on configured level
-        log_level = self.config.get_log_level().lower()
-        levels = {'error': 0, 'warn': 1, 'info': 2, 'debug': 3}
-        current_level = levels.get(level, 2)
-        configured_level = levels.get(log_level, 2)
+        # Serialized here so later mutation of metadata by the caller cannot leak into the line
+        self._writer.write(orjson.dumps(
+            log_entry,
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        ))
 
-        if current_level <= configured_level:
-            print(json.dumps(log_entry))
+    def get_stats(self) -> Dict[str, int]:
+        return self._writer.get_stats()
 
     def info(self, message: str, metadata: Optional[Dict[str, Any]] = None):
         self._log('info', message, metadata)
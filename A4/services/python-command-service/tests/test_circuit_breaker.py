@@ -0,0 +1,195 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from clients import circuit_breaker
+from clients.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', fake)
+    return fake
+
+
+def make_breaker(**settings):
+    defaults = {'failure_rate_threshold': 0.5, 'minimum_calls': 4, 'window_seconds': 10, 'recovery_timeout': 30.0}
+    return CircuitBreaker('sensor-service', **{**defaults, **settings})
+
+
+async def succeed():
+    return 'ok'
+
+
+async def fail():
+    raise ConnectionError('sensor service down')
+
+
+def run_calls(breaker, outcomes):
+    """Drive the breaker with a sequence of True (success) / False (failure) calls"""
+
+    async def scenario():
+        for ok in outcomes:
+            try:
+                await breaker.call(succeed if ok else fail)
+            except ConnectionError:
+                pass
+
+    asyncio.run(scenario())
+
+
+def trip(breaker):
+    run_calls(breaker, [False] * breaker.minimum_calls)
+    assert breaker.state == OPEN
+
+
+class TestFailureRateWindow:
+    def test_stays_closed_until_minimum_calls(self, clock):
+        breaker = make_breaker()
+
+        run_calls(breaker, [False, False, False])
+
+        assert breaker.state == CLOSED
+
+    def test_opens_when_failure_rate_reaches_threshold(self, clock):
+        breaker = make_breaker()
+
+        run_calls(breaker, [True, True, False, False])
+
+        assert breaker.state == OPEN
+        assert breaker.get_stats()['window_failure_rate'] == 0.5
+
+    def test_stays_closed_below_threshold(self, clock):
+        breaker = make_breaker()
+
+        run_calls(breaker, [True, True, True, True, False, False, False])
+
+        assert breaker.state == CLOSED
+
+    def test_failures_older_than_the_window_are_forgotten(self, clock):
+        breaker = make_breaker()
+        run_calls(breaker, [False, False, False])
+
+        clock.now += 10
+        # 4 failures out of 7 calls in total, but only 1 of 4 inside the window
+        run_calls(breaker, [True, True, True, False])
+
+        assert breaker.state == CLOSED
+        assert breaker.get_stats()['window_calls'] == 4
+
+    def test_errors_rejected_by_is_failure_do_not_count(self, clock):
+        breaker = make_breaker(is_failure=lambda error: not isinstance(error, ConnectionError))
+
+        run_calls(breaker, [False] * 10)
+
+        assert breaker.state == CLOSED
+        assert breaker.get_stats()['failures_total'] == 0
+
+    def test_open_breaker_fails_fast_without_calling(self, clock):
+        breaker = make_breaker()
+        trip(breaker)
+        calls = []
+
+        async def dependency():
+            calls.append(1)
+
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(breaker.call(dependency))
+
+        assert calls == []
+        assert breaker.get_stats()['rejected_total'] == 1
+
+
+class TestHalfOpen:
+    def test_stays_open_until_recovery_timeout(self, clock):
+        breaker = make_breaker()
+        trip(breaker)
+
+        clock.now += 29.9
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(breaker.call(succeed))
+
+        assert breaker.state == OPEN
+
+    def test_only_one_probe_is_let_through(self, clock):
+        breaker = make_breaker()
+        trip(breaker)
+        clock.now += 30
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def slow_probe():
+                await release.wait()
+                return 'probe'
+
+            probe = asyncio.ensure_future(breaker.call(slow_probe))
+            await asyncio.sleep(0)
+            assert breaker.state == HALF_OPEN
+
+            with pytest.raises(CircuitOpenError, match='probe in flight'):
+                await breaker.call(succeed)
+
+            release.set()
+            return await probe
+
+        assert asyncio.run(scenario()) == 'probe'
+        assert breaker.state == CLOSED
+        assert asyncio.run(breaker.call(succeed)) == 'ok'
+
+    def test_failed_probe_reopens_and_restarts_the_timer(self, clock):
+        breaker = make_breaker()
+        trip(breaker)
+        clock.now += 30
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(breaker.call(fail))
+
+        assert breaker.state == OPEN
+        assert breaker.opened_at == clock.now
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(breaker.call(succeed))
+
+    def test_cancelled_probe_frees_the_slot(self, clock):
+        breaker = make_breaker()
+        trip(breaker)
+        clock.now += 30
+
+        async def scenario():
+            probe = asyncio.ensure_future(breaker.call(asyncio.sleep, 3600))
+            await asyncio.sleep(0)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            # No verdict from the cancelled probe, so the next caller becomes the probe
+            return await breaker.call(succeed)
+
+        assert asyncio.run(scenario()) == 'ok'
+        assert breaker.state == CLOSED
+
+    def test_successful_probe_starts_a_fresh_window(self, clock):
+        breaker = make_breaker(window_seconds=60)
+        trip(breaker)
+        clock.now += 30
+
+        asyncio.run(breaker.call(succeed))
+        # Still inside the window, but the failures that opened the breaker must not count again
+        run_calls(breaker, [False, False])
+
+        assert breaker.state == CLOSED
+        assert breaker.get_stats()['transitions_total'] == {'closed': 1, 'open': 1, 'half_open': 1}
@@ -0,0 +1,171 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from clients.hedging import LatencyTracker, hedged
+
+# Long enough that a primary which answers at once never triggers the hedge
+NO_HEDGE = 60.0
+# Short enough that a primary which waits on an event always does
+HEDGE_NOW = 0.001
+
+
+class Attempts:
+    """
+    attempt() for hedged(): the n-th call runs behaviours[n] and records how it ended.
+    A behaviour is an async function; it may wait on events the test controls.
+    """
+
+    def __init__(self, *behaviours):
+        self.behaviours = list(behaviours)
+        self.started = 0
+        self.outcomes = {}
+
+    async def __call__(self):
+        index = self.started
+        self.started += 1
+        try:
+            result = await self.behaviours[index]()
+        except asyncio.CancelledError:
+            self.outcomes[index] = 'cancelled'
+            raise
+        except Exception:
+            self.outcomes[index] = 'failed'
+            raise
+        self.outcomes[index] = 'done'
+        return result
+
+
+def returns(value, after: asyncio.Event = None):
+    async def behaviour():
+        if after is not None:
+            await after.wait()
+        return value
+    return behaviour
+
+
+def raises(error, after: asyncio.Event = None):
+    async def behaviour():
+        if after is not None:
+            await after.wait()
+        raise error
+    return behaviour
+
+
+def hangs():
+    return returns(None, after=asyncio.Event())
+
+
+async def wait_for_hedge(attempts):
+    while attempts.started < 2:
+        await asyncio.sleep(HEDGE_NOW)
+
+
+class TestHedged:
+    def test_fast_primary_is_not_hedged(self):
+        attempts = Attempts(returns('primary'))
+
+        assert asyncio.run(hedged(attempts, NO_HEDGE)) == 'primary'
+        assert attempts.started == 1
+
+    def test_slow_primary_is_hedged_and_cancelled_when_hedge_wins(self):
+        async def scenario():
+            attempts = Attempts(hangs(), returns('hedge'))
+            result = await hedged(attempts, HEDGE_NOW)
+            await asyncio.sleep(0)
+            # Snapshot before asyncio.run() cancels whatever is still pending
+            return dict(attempts.outcomes), result
+
+        outcomes, result = asyncio.run(scenario())
+
+        assert result == 'hedge'
+        assert outcomes == {0: 'cancelled', 1: 'done'}
+
+    def test_hedge_is_cancelled_when_primary_wins(self):
+        async def scenario():
+            primary_done = asyncio.Event()
+            attempts = Attempts(returns('primary', after=primary_done), hangs())
+            call = asyncio.ensure_future(hedged(attempts, HEDGE_NOW))
+            await wait_for_hedge(attempts)
+            primary_done.set()
+            result = await call
+            await asyncio.sleep(0)
+            # Snapshot before asyncio.run() cancels whatever is still pending
+            return dict(attempts.outcomes), result
+
+        outcomes, result = asyncio.run(scenario())
+
+        assert result == 'primary'
+        assert outcomes == {0: 'done', 1: 'cancelled'}
+
+    def test_failed_primary_falls_back_to_the_hedge(self):
+        async def scenario():
+            primary_fails, hedge_done = asyncio.Event(), asyncio.Event()
+            attempts = Attempts(
+                raises(ConnectionError('reset'), after=primary_fails),
+                returns('hedge', after=hedge_done),
+            )
+            call = asyncio.ensure_future(hedged(attempts, HEDGE_NOW))
+            await wait_for_hedge(attempts)
+            primary_fails.set()
+            await asyncio.sleep(0)
+            hedge_done.set()
+            return await call
+
+        assert asyncio.run(scenario()) == 'hedge'
+
+    def test_when_both_fail_the_primary_error_is_raised(self):
+        primary_error = ConnectionError('primary')
+
+        async def scenario():
+            release = asyncio.Event()
+            attempts = Attempts(raises(primary_error, after=release), raises(TimeoutError('hedge'), after=release))
+            call = asyncio.ensure_future(hedged(attempts, HEDGE_NOW))
+            await wait_for_hedge(attempts)
+            release.set()
+            return await call
+
+        with pytest.raises(ConnectionError) as raised:
+            asyncio.run(scenario())
+        assert raised.value is primary_error
+
+    def test_cancelling_the_caller_cancels_every_attempt(self):
+        async def scenario():
+            attempts = Attempts(hangs(), hangs())
+            call = asyncio.ensure_future(hedged(attempts, HEDGE_NOW))
+            await wait_for_hedge(attempts)
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+            await asyncio.sleep(0)
+            return dict(attempts.outcomes)
+
+        assert asyncio.run(scenario()) == {0: 'cancelled', 1: 'cancelled'}
+
+
+class TestLatencyTracker:
+    def test_no_estimate_until_min_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(0.1)
+        tracker.record(0.2)
+
+        assert tracker.percentile(0.95) is None
+
+        tracker.record(0.3)
+        assert tracker.percentile(0.95) == 0.3
+
+    def test_percentile_uses_only_recent_samples(self):
+        tracker = LatencyTracker(max_samples=10, min_samples=1)
+        for _ in range(10):
+            tracker.record(5.0)
+        for ms in range(1, 11):
+            tracker.record(ms / 1000)
+
+        assert tracker.percentile(0.5) == 0.006
+        assert tracker.percentile(0.95) == 0.01
@@ -0,0 +1,254 @@
+import asyncio
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config.config import Config
+from middleware import rate_limiter
+from middleware.rate_limiter import MemoryRateLimitBackend, PostgresRateLimitBackend, RateLimiterMiddleware
+
+API_KEY = 'test-api-key-123'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake)
+    return fake
+
+
+@pytest.fixture
+def config(monkeypatch):
+    monkeypatch.setenv('API_KEY', API_KEY)
+    monkeypatch.setenv('RATE_LIMIT_RATE', '1')
+    monkeypatch.setenv('RATE_LIMIT_BURST', '2')
+    monkeypatch.setenv('RATE_LIMIT_TRUST_PROXY', 'true')
+    return Config()
+
+
+def make_client(config, backend):
+    app = FastAPI()
+
+    @app.get('/ping')
+    async def ping():
+        return {'ok': True}
+
+    app.add_middleware(RateLimiterMiddleware, backend=backend, config=config)
+    return TestClient(app)
+
+
+class RecordingBackend:
+    """Always allows; remembers the bucket keys it was asked for"""
+
+    def __init__(self):
+        self.keys = []
+
+    async def acquire(self, key, rate, capacity):
+        self.keys.append(key)
+        return True, 0.0
+
+
+class TestMemoryBackend:
+    def test_burst_then_reject_with_retry_after(self, clock):
+        backend = MemoryRateLimitBackend()
+
+        assert asyncio.run(backend.acquire('k', 2.0, 2)) == (True, 0.0)
+        assert asyncio.run(backend.acquire('k', 2.0, 2)) == (True, 0.0)
+        allowed, retry_after = asyncio.run(backend.acquire('k', 2.0, 2))
+
+        assert not allowed
+        # Empty bucket refilling at 2 tokens/s needs half a second for the next token
+        assert retry_after == pytest.approx(0.5)
+
+    def test_refill_is_capped_at_capacity(self, clock):
+        backend = MemoryRateLimitBackend()
+        for _ in range(2):
+            asyncio.run(backend.acquire('k', 1.0, 2))
+
+        clock.now += 0.5
+        assert not asyncio.run(backend.acquire('k', 1.0, 2))[0]
+
+        clock.now += 3600
+        results = [asyncio.run(backend.acquire('k', 1.0, 2))[0] for _ in range(3)]
+        assert results == [True, True, False]
+
+    def test_keys_are_independent_and_lru_evicted(self, clock):
+        backend = MemoryRateLimitBackend(max_keys=2)
+        asyncio.run(backend.acquire('a', 1.0, 1))
+        asyncio.run(backend.acquire('b', 1.0, 1))
+        asyncio.run(backend.acquire('c', 1.0, 1))
+
+        # 'a' was evicted, so it starts again with a full bucket
+        assert asyncio.run(backend.acquire('a', 1.0, 1))[0]
+        assert not asyncio.run(backend.acquire('c', 1.0, 1))[0]
+
+
+class TestMiddleware:
+    def test_returns_429_with_retry_after(self, config, clock):
+        client = make_client(config, MemoryRateLimitBackend())
+
+        assert client.get('/ping').status_code == 200
+        assert client.get('/ping').status_code == 200
+        response = client.get('/ping')
+
+        assert response.status_code == 429
+        assert response.json() == {'detail': 'Rate limit exceeded'}
+        assert response.headers['Retry-After'] == '1'
+
+    def test_fails_open_when_backend_is_down(self, config):
+        class BrokenBackend:
+            async def acquire(self, key, rate, capacity):
+                raise ConnectionError('store unreachable')
+
+        assert make_client(config, BrokenBackend()).get('/ping').status_code == 200
+
+    def test_only_the_valid_api_key_gets_a_key_bucket(self, config):
+        backend = RecordingBackend()
+        client = make_client(config, backend)
+
+        client.get('/ping')
+        client.get('/ping', headers={'Authorization': f'Bearer {API_KEY}'})
+        client.get('/ping', headers={'Authorization': 'Bearer forged-1'})
+        client.get('/ping', headers={'Authorization': 'Bearer forged-2'})
+
+        anonymous, valid, forged_1, forged_2 = backend.keys
+        assert valid.startswith('read:key:')
+        assert API_KEY not in valid
+        # Unknown tokens share the caller's IP bucket instead of minting new ones
+        assert forged_1 == forged_2 == anonymous
+
+    @pytest.mark.parametrize('headers, expected', [
+        ({'X-Forwarded-For': '203.0.113.7, 10.0.0.1'}, 'read:ip:203.0.113.7'),
+        ({'X-Real-IP': '2001:DB8::1'}, 'read:ip:2001:db8::1'),
+        ({'X-Forwarded-For': 'x' * 10000}, None),
+        ({'X-Real-IP': 'fe80::1%' + 'x' * 500}, None),
+    ])
+    def test_forwarded_ip_must_be_an_address(self, config, headers, expected):
+        backend = RecordingBackend()
+        client = make_client(config, backend)
+        client.get('/ping')
+        client.get('/ping', headers=headers)
+
+        # None: not an address, so the socket peer's bucket is used
+        peer, forwarded = backend.keys
+        assert forwarded == (expected or peer)
+
+
+class TestAppWiring:
+    def test_429_carries_correlation_id(self, monkeypatch):
+        monkeypatch.setenv('RATE_LIMIT_BACKEND', 'memory')
+        monkeypatch.setenv('RATE_LIMIT_BURST', '0')
+        from app import app
+
+        # Rebuild the middleware stack so the limiter picks up this test's settings
+        monkeypatch.setattr(app, 'middleware_stack', None)
+        response = TestClient(app).get('/health', headers={'X-Correlation-ID': 'req-limited'})
+
+        assert response.status_code == 429
+        assert response.headers['X-Correlation-ID'] == 'req-limited'
+
+
+class FakeConnection:
+    def __init__(self, row):
+        self.row = row
+        self.fetches = []
+        self.executed = []
+
+    async def fetchrow(self, sql, *args):
+        self.fetches.append(args)
+        return self.row
+
+    async def execute(self, sql, *args):
+        self.executed.append(sql)
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+
+class TestPostgresBackend:
+    def test_maps_row_to_decision_and_prunes_periodically(self):
+        conn = FakeConnection({'allowed': False, 'tokens': 0.25})
+        pool = FakePool(conn)
+
+        async def get_pool():
+            return pool
+
+        backend = PostgresRateLimitBackend(get_pool, prune_every=3)
+
+        results = [asyncio.run(backend.acquire('read:ip:1.2.3.4', 5.0, 10)) for _ in range(3)]
+
+        assert results == [(False, pytest.approx(0.15))] * 3
+        assert conn.fetches[0] == ('read:ip:1.2.3.4', 5.0, 10.0)
+        assert conn.executed == [PostgresRateLimitBackend.PRUNE_SQL]
+
+    def test_upsert_against_real_postgres(self):
+        testing_postgresql = pytest.importorskip('testing.postgresql')
+        asyncpg = pytest.importorskip('asyncpg')
+        if shutil.which('initdb') is None:
+            pytest.skip('initdb not on PATH')
+        if os.geteuid() == 0:
+            pytest.skip('initdb refuses to run as root')
+
+        migration = (SRC_DIR / 'migrations' / '005_create_rate_limit_buckets.sql').read_text()
+
+        async def scenario(dsn):
+            pool = await asyncpg.create_pool(dsn, min_size=1, max_size=2)
+            try:
+                async with pool.acquire() as conn:
+                    await conn.execute(migration)
+
+                async def get_pool():
+                    return pool
+
+                backend = PostgresRateLimitBackend(get_pool)
+                # Slow refill so the test's own runtime cannot add a token
+                decisions = [await backend.acquire('write:key:abc', 0.001, 2) for _ in range(3)]
+
+                async with pool.acquire() as conn:
+                    await conn.execute(
+                        "UPDATE rate_limit_buckets SET refreshed_at = refreshed_at - INTERVAL '2000 seconds'"
+                    )
+                refilled = await backend.acquire('write:key:abc', 0.001, 2)
+                other = await backend.acquire('write:key:other', 0.001, 2)
+                return decisions, refilled, other
+            finally:
+                await pool.close()
+
+        with testing_postgresql.Postgresql() as postgresql:
+            decisions, refilled, other = asyncio.run(scenario(postgresql.url()))
+
+        assert [allowed for allowed, _ in decisions] == [True, True, False]
+        assert decisions[2][1] == pytest.approx(1000, rel=0.01)
+        assert refilled == (True, 0.0)
+        assert other == (True, 0.0)
@@ -0,0 +1,157 @@
+import asyncio
+import gc
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src directory to path
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from clients.single_flight import SingleFlight
+
+
+class Fetch:
+    """The shared work: counts how often it starts and waits until the test releases it"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        async def scenario():
+            flight = SingleFlight()
+            fetch = Fetch(result={'sensor_id': 's1'})
+            callers = [asyncio.ensure_future(flight.do('s1', fetch)) for _ in range(3)]
+            await asyncio.sleep(0)
+            in_flight = flight.get_stats()['in_flight']
+            fetch.release.set()
+            return flight, fetch, in_flight, await asyncio.gather(*callers)
+
+        flight, fetch, in_flight, results = asyncio.run(scenario())
+
+        assert fetch.calls == 1
+        assert in_flight == 1
+        assert results[0] is results[1] is results[2]
+        assert flight.get_stats() == {'started': 1, 'coalesced': 2, 'in_flight': 0}
+
+    def test_different_keys_are_not_coalesced(self):
+        async def scenario():
+            flight = SingleFlight()
+            first, second = Fetch(result=1), Fetch(result=2)
+            callers = [asyncio.ensure_future(flight.do('s1', first)), asyncio.ensure_future(flight.do('s2', second))]
+            await asyncio.sleep(0)
+            first.release.set()
+            second.release.set()
+            return await asyncio.gather(*callers)
+
+        assert asyncio.run(scenario()) == [1, 2]
+
+    def test_nothing_is_cached_after_completion(self):
+        async def scenario():
+            flight = SingleFlight()
+            fetch = Fetch(result='value')
+            fetch.release.set()
+            await flight.do('s1', fetch)
+            assert flight.is_leader('s1')
+            await flight.do('s1', fetch)
+            return fetch.calls
+
+        assert asyncio.run(scenario()) == 2
+
+    def test_error_reaches_every_waiter(self):
+        async def scenario():
+            flight = SingleFlight()
+            fetch = Fetch(error=ConnectionError('sensor service down'))
+            callers = [asyncio.ensure_future(flight.do('s1', fetch)) for _ in range(2)]
+            await asyncio.sleep(0)
+            fetch.release.set()
+            return await asyncio.gather(*callers, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert results[0] is results[1]
+
+    def test_cancelled_follower_does_not_cancel_the_flight(self):
+        async def scenario():
+            flight = SingleFlight()
+            fetch = Fetch(result='value')
+            leader = asyncio.ensure_future(flight.do('s1', fetch))
+            follower = asyncio.ensure_future(flight.do('s1', fetch))
+            await asyncio.sleep(0)
+
+            follower.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await follower
+
+            fetch.release.set()
+            return fetch, await leader
+
+        fetch, result = asyncio.run(scenario())
+
+        assert result == 'value'
+        assert fetch.calls == 1
+        assert not fetch.cancelled
+
+    def test_cancelled_leader_does_not_cancel_the_flight(self):
+        async def scenario():
+            flight = SingleFlight()
+            fetch = Fetch(result='value')
+            leader = asyncio.ensure_future(flight.do('s1', fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do('s1', fetch))
+            await asyncio.sleep(0)
+
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+
+            fetch.release.set()
+            return fetch, await follower
+
+        fetch, result = asyncio.run(scenario())
+
+        assert result == 'value'
+        assert not fetch.cancelled
+
+    def test_failure_with_no_waiters_left_is_retrieved(self):
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            unretrieved = []
+            loop.set_exception_handler(lambda loop, context: unretrieved.append(context))
+
+            flight = SingleFlight()
+            fetch = Fetch(error=ConnectionError('sensor service down'))
+            caller = asyncio.ensure_future(flight.do('s1', fetch))
+            await asyncio.sleep(0)
+            caller.cancel()
+            fetch.release.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            # asyncio only reports an unretrieved exception when the task is collected
+            del caller
+            gc.collect()
+            return flight, unretrieved
+
+        flight, unretrieved = asyncio.run(scenario())
+
+        assert unretrieved == []
+        assert flight.get_stats()['in_flight'] == 0
@@ -1,26 +1,58 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from routes.sensors import router as sensors_router
 from middleware.correlation_id import CorrelationIdMiddleware
-from db.connection import get_pool, initialize_database
+from middleware.deadline import DeadlineMiddleware
+from db.connection import get_pool, initialize_database, close_pool
+from events.rabbitmq_client import start_publisher, get_publisher_stats, close_connection
+from events.cache_invalidator import CacheInvalidator
+from dependencies import get_container, reset_container, get_sensor_cache, get_logger
 import asyncio
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Initialize database and the shared object graph on startup
+    try:
+        await initialize_database()
+        await get_container()
+    except Exception as e:
+        print(f"Failed to initialize database: {e}")
+
+    # Event publishing runs in the background; requests only enqueue
+    start_publisher()
+
+    # sensor.updated events evict this process's cached copies
+    cache_invalidator = CacheInvalidator(get_sensor_cache(), get_logger())
+    cache_invalidator_task = asyncio.create_task(cache_invalidator.run())
+
+    yield
+
+    cache_invalidator_task.cancel()
+    try:
+        await cache_invalidator.stop()
+    except Exception as e:
+        print(f"Failed to stop cache invalidator: {e}")
+    await close_connection()
+    reset_container()
+    await close_pool()
+
+
 app = FastAPI(
     title="Sensor Microservice API",
     description="IoT Smart Home Sensors microservice",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    # orjson encodes response bodies natively instead of the stdlib json module
+    default_response_class=ORJSONResponse
 )
 
+# Stop work once the caller's X-Request-Timeout-Ms budget is spent (added first, so it runs inside correlation ID)
+app.add_middleware(DeadlineMiddleware)
 # Add correlation ID middleware
 app.add_middleware(CorrelationIdMiddleware)
 
-# Initialize database on startup
-@app.on_event("startup")
-async def startup_event():
-    try:
-        await initialize_database()
-    except Exception as e:
-        print(f"Failed to initialize database: {e}")
-
 # Health check endpoint with database status
 @app.get("/health")
 async def health():
@@ -28,7 +60,7 @@ async def health():
         pool = await get_pool()
         async with pool.acquire() as conn:
             await conn.fetchval('SELECT 1')
-        return {"status": "ok", "service": "python", "database": "connected"}
+        return {"status": "ok", "service": "python", "database": "connected", "events": get_publisher_stats(), "cache": get_sensor_cache().get_stats(), "logs": get_logger().get_stats()}
     except Exception as e:
         return {"status": "error", "service": "python", "database": "disconnected", "error": str(e)}
 
@@ -1,5 +1,10 @@
-from typing import Optional, Dict, Any
+import json
+import orjson
+from typing import Optional, Dict, Any, List
 from fastapi import HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from models.sensor import SensorCreate
 from services.sensor_service import SensorService
 from services.logger import Logger
 
@@ -14,29 +19,81 @@ class SensorController:
         request: Request,
         type: Optional[str] = Query(None),
         limit: Optional[int] = Query(None),
-        offset: int = Query(0)
+        offset: int = Query(0),
+        order_by: str = Query('timestamp'),
+        order: str = Query('desc'),
+        cursor: Optional[str] = Query(None)
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
+            filters = {
+                'type': type,
+                'limit': limit,
+                'offset': offset,
+                'order_by': order_by,
+                'order': order,
+                'cursor': cursor
+            }
+
+            # Keyset mode: a limited request without an offset gets a next_cursor
+            if limit and not offset:
+                page = await self.service.get_sensors_page(filters)
+                return {'data': page['data'], 'count': len(page['data']), 'next_cursor': page['next_cursor']}
 
-            filters = {'type': type, 'limit': limit, 'offset': offset}
             sensors = await self.service.get_all_sensors(filters)
-            
             return {'data': sensors, 'count': len(sensors)}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             self.logger.error('Error fetching sensors', {'error': str(e)})
             raise HTTPException(status_code=500, detail='Internal server error')
 
+    async def stream_sensors(
+        self,
+        request: Request,
+        filters: Dict[str, Any],
+        fetch_size: int
+    ) -> StreamingResponse:
+        """
+        Stream every matching sensor as rows arrive from the database cursor, so memory
+        stays flat however many rows match. NDJSON when the client accepts
+        application/x-ndjson, otherwise the usual {"data": [...], "count": n} document.
+        """
+        try:
+            batches = self.service.stream_sensors(filters, fetch_size)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        async def ndjson_body():
+            async for batch in batches:
+                yield b''.join(orjson.dumps(sensor, option=orjson.OPT_APPEND_NEWLINE) for sensor in batch)
+
+        async def json_body():
+            count = 0
+            yield b'{"data":['
+            async for batch in batches:
+                yield (b',' if count else b'') + b','.join(orjson.dumps(sensor) for sensor in batch)
+                count += len(batch)
+            yield b'],"count":%d}' % count
+
+        async def logged(body):
+            try:
+                async for chunk in body:
+                    yield chunk
+            except Exception as e:
+                # Headers are already sent; all that is left is to cut the response short
+                self.logger.error('Error streaming sensors', {'error': str(e)})
+                raise
+
+        if 'application/x-ndjson' in request.headers.get('accept', ''):
+            return StreamingResponse(logged(ndjson_body()), media_type='application/x-ndjson')
+        return StreamingResponse(logged(json_body()), media_type='application/json')
+
     async def get_sensor_by_id(
         self,
         request: Request,
         sensor_id: str
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             return await self.service.get_sensor_by_id(sensor_id)
         except ValueError as e:
             if 'not found' in str(e):
@@ -46,15 +103,28 @@ class SensorController:
             self.logger.error('Error fetching sensor', {'error': str(e)})
             raise HTTPException(status_code=500, detail='Internal server error')
 
+    async def lookup_sensors(
+        self,
+        request: Request,
+        sensor_ids: List[str],
+        max_lookup_size: int
+    ) -> Dict[str, Any]:
+        if len(sensor_ids) > max_lookup_size:
+            raise HTTPException(status_code=413, detail=f'Lookup exceeds {max_lookup_size} sensor ids')
+
+        try:
+            result = await self.service.get_sensors_by_ids(sensor_ids)
+            return {'data': result['data'], 'count': len(result['data']), 'missing': result['missing']}
+        except Exception as e:
+            self.logger.error('Error looking up sensors', {'error': str(e)})
+            raise HTTPException(status_code=500, detail='Internal server error')
+
     async def create_sensor(
         self,
         request: Request,
         sensor_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         try:
-            correlation_id = getattr(request.state, 'correlation_id', None)
-            self.logger.set_correlation_id(correlation_id or '')
-
             created = await self.service.create_sensor(sensor_data)
             return created
         except ValueError as e:
@@ -66,3 +136,61 @@ class SensorController:
         except Exception as e:
             self.logger.error('Error creating sensor', {'error': str(e)})
             raise HTTPException(status_code=500, detail='Internal server error')
+
+    async def create_sensors_batch(
+        self,
+        request: Request,
+        max_batch_size: int
+    ) -> Dict[str, Any]:
+        items = await self._parse_batch(request)
+        if len(items) > max_batch_size:
+            raise HTTPException(status_code=413, detail=f'Batch exceeds {max_batch_size} readings')
+
+        try:
+            # Schema validation per item; failures are reported, not raised
+            results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+            sensors = []
+            positions = []
+            for index, item in enumerate(items):
+                try:
+                    sensors.append(SensorCreate(**item).dict())
+                    positions.append(index)
+                except ValidationError as e:
+                    error = '; '.join(err['msg'] for err in e.errors())
+                    results[index] = {'index': index, 'status': 'invalid', 'error': error}
+                except TypeError:
+                    results[index] = {'index': index, 'status': 'invalid', 'error': 'Item must be an object'}
+
+            created = await self.service.create_sensors_batch(sensors)
+            for index, result in zip(positions, created):
+                results[index] = {'index': index, **result}
+
+            counts = {'created': 0, 'duplicate': 0, 'invalid': 0}
+            for result in results:
+                counts[result['status']] += 1
+
+            return {
+                'created': counts['created'],
+                'duplicates': counts['duplicate'],
+                'invalid': counts['invalid'],
+                'results': results
+            }
+        except Exception as e:
+            self.logger.error('Error creating sensor batch', {'error': str(e)})
+            raise HTTPException(status_code=500, detail='Internal server error')
+
+    async def _parse_batch(self, request: Request) -> List[Any]:
+        """Accept a JSON array, or NDJSON (one reading per line)"""
+        body = await request.body()
+        content_type = request.headers.get('content-type', '')
+
+        try:
+            if 'ndjson' in content_type:
+                return [json.loads(line) for line in body.splitlines() if line.strip()]
+            items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail='Request body must be a JSON array or NDJSON')
+
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail='Request body must be a JSON array or NDJSON')
+        return items
@@ -44,6 +44,11 @@ async def initialize_database():
             migration2 = f.read()
             async with pool.acquire() as conn:
                 await conn.execute(migration2)
+
+        with open(os.path.join(migrations_dir, '003_add_keyset_indexes.sql'), 'r') as f:
+            migration3 = f.read()
+            async with pool.acquire() as conn:
+                await conn.execute(migration3)
         
         print('Database initialized successfully')
     except Exception as error:
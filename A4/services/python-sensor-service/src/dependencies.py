@@ -1,7 +1,9 @@
 from functools import lru_cache
+from typing import Optional
 from config.config import Config
 from services.logger import Logger
 from repositories.sensor_repository import SensorRepository
+from repositories.sensor_cache import SensorCache, CachedSensorRepository
 from services.sensor_service import SensorService
 from controllers.sensor_controller import SensorController
 from db.connection import get_pool, initialize_database
@@ -13,27 +15,56 @@ def get_config() -> Config:
     return Config()
 
 
+@lru_cache()
 def get_logger() -> Logger:
     config = get_config()
     return Logger(config)
 
 
-async def get_repository() -> SensorRepository:
-    pool = await get_pool()
-    return SensorRepository(pool)
+@lru_cache()
+def get_sensor_cache() -> SensorCache:
+    config = get_config()
+    return SensorCache(config.get_sensor_cache_size(), config.get_sensor_cache_ttl_seconds())
+
+
+class Container:
+    """Application-scoped object graph: built once per process, shared by every request"""
+
+    def __init__(self, pool):
+        self.logger = get_logger()
+        self.repository = CachedSensorRepository(SensorRepository(pool), get_sensor_cache())
+        self.event_publisher = SensorEventPublisher()  # Bulkhead: separate event bus connection
+        self.sensor_service = SensorService(self.repository, self.logger, self.event_publisher)
+        self.sensor_controller = SensorController(self.sensor_service, self.logger)
+
+
+_container: Optional[Container] = None
+
+
+async def get_container() -> Container:
+    """Return the container, building it on first use if startup could not (e.g. database was down)"""
+    global _container
+    if _container is None:
+        pool = await get_pool()
+        _container = Container(pool)
+    return _container
+
+
+def reset_container():
+    global _container
+    _container = None
+
+
+async def get_repository() -> CachedSensorRepository:
+    return (await get_container()).repository
 
 
 async def get_sensor_service() -> SensorService:
-    repository = await get_repository()
-    logger = get_logger()
-    event_publisher = SensorEventPublisher()  # Bulkhead: separate event bus connection
-    return SensorService(repository, logger, event_publisher)
+    return (await get_container()).sensor_service
 
 
 async def get_sensor_controller() -> SensorController:
-    service = await get_sensor_service()
-    logger = get_logger()
-    return SensorController(service, logger)
+    return (await get_container()).sensor_controller
 
 
 def get_api_key() -> str:
@@ -0,0 +1,55 @@
+import asyncio
+import json
+from typing import Optional
+import aio_pika
+from events.rabbitmq_client import get_connection
+
+
+class CacheInvalidator:
+    """
+    Drops cached sensors when a sensor.updated event arrives. Each process binds
+    its own exclusive queue, so every worker's cache hears about every update.
+    """
+
+    def __init__(self, cache, logger):
+        self.cache = cache
+        self.logger = logger
+        self._channel = None
+        self._queue = None
+        self._consumer_tag: Optional[str] = None
+
+    async def start(self):
+        connection = await get_connection()
+        self._channel = await connection.channel()
+        exchange = await self._channel.declare_exchange('sensor.events', aio_pika.ExchangeType.TOPIC, durable=True)
+
+        # Server-named, exclusive: removed with the connection, one per process
+        self._queue = await self._channel.declare_queue('', exclusive=True)
+        await self._queue.bind(exchange, routing_key='sensor.updated')
+        self._consumer_tag = await self._queue.consume(self._handle_message, no_ack=True)
+        self.logger.info('Sensor cache invalidator started')
+
+    async def run(self, retry_delay: float = 5.0):
+        """Start the invalidator, retrying until the broker is reachable"""
+        while True:
+            try:
+                await self.start()
+                return
+            except Exception as error:
+                self.logger.error('Failed to start sensor cache invalidator', {'error': str(error)})
+                await asyncio.sleep(retry_delay)
+
+    async def stop(self):
+        if self._queue and self._consumer_tag:
+            await self._queue.cancel(self._consumer_tag)
+            self._consumer_tag = None
+        if self._channel and not self._channel.is_closed:
+            await self._channel.close()
+            self._channel = None
+
+    async def _handle_message(self, message):
+        try:
+            event = json.loads(message.body)
+            self.cache.invalidate(event['data']['sensor_id'])
+        except Exception as error:
+            self.logger.error('Error processing sensor.updated event', {'error': str(error)})
@@ -1,75 +1,182 @@
-import pika
+import asyncio
 import json
+import aio_pika
+from aio_pika.exceptions import AMQPConnectionError, ChannelClosed, ChannelInvalidStateError
 from config.config import Config
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+EXCHANGES = ('sensor.events', 'command.events')
 
 # Bulkhead: Separate connection for event bus
 _connection = None
 _channel = None
+_exchanges: Dict[str, Any] = {}
+
+# Bounded outbound buffer, drained by a background task on the app's event loop
+_buffer: Optional[asyncio.Queue] = None
+_publisher_task: Optional[asyncio.Task] = None
+_stats = {'published': 0, 'dropped': 0, 'failed': 0}
 
 
-def get_connection():
+async def get_connection():
     """Get or create RabbitMQ connection (Bulkhead pattern)"""
     global _connection
     if _connection is None or _connection.is_closed:
         config = Config()
-        url = config.get_rabbitmq_url()
-        
-        # Parse URL
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        
-        credentials = pika.PlainCredentials(parsed.username or 'admin', parsed.password or 'admin')
-        parameters = pika.ConnectionParameters(
-            host=parsed.hostname or 'localhost',
-            port=parsed.port or 5672,
-            virtual_host=parsed.path[1:] if parsed.path else '/',
-            credentials=credentials
-        )
-        
-        _connection = pika.BlockingConnection(parameters)
+        # Robust connection: reconnects and restores channels after broker restarts
+        _connection = await aio_pika.connect_robust(config.get_rabbitmq_url())
         print('RabbitMQ connection established')
     return _connection
 
 
-def get_channel():
-    """Get or create RabbitMQ channel"""
+async def get_channel():
+    """Get or create RabbitMQ channel with publisher confirms enabled"""
     global _channel
     if _channel is None or _channel.is_closed:
-        conn = get_connection()
-        _channel = conn.channel()
-        
+        conn = await get_connection()
+        # Publisher confirms: publish() resolves once the broker has taken the message
+        _channel = await conn.channel(publisher_confirms=True)
+
         # Declare exchanges
-        _channel.exchange_declare(exchange='sensor.events', exchange_type='topic', durable=True)
-        _channel.exchange_declare(exchange='command.events', exchange_type='topic', durable=True)
-        
+        _exchanges.clear()
+        for name in EXCHANGES:
+            _exchanges[name] = await _channel.declare_exchange(name, aio_pika.ExchangeType.TOPIC, durable=True)
+
         print('RabbitMQ channel established')
     return _channel
 
 
+def _get_buffer() -> asyncio.Queue:
+    global _buffer
+    if _buffer is None:
+        _buffer = asyncio.Queue(maxsize=Config().get_event_buffer_size())
+    return _buffer
+
+
 def publish_event(exchange: str, routing_key: str, event: Dict[str, Any]) -> bool:
-    """Publish event to RabbitMQ"""
+    """
+    Hand an event to the background publisher without blocking the caller.
+    Returns False when the event cannot be serialized or the buffer is full.
+    """
     try:
-        ch = get_channel()
-        message = json.dumps(event)
-        ch.basic_publish(
-            exchange=exchange,
-            routing_key=routing_key,
-            body=message,
-            properties=pika.BasicProperties(delivery_mode=2)  # Make message persistent
-        )
-        return True
-    except Exception as error:
+        body = json.dumps(event).encode('utf-8')
+    except (TypeError, ValueError) as error:
         print(f'Failed to publish event: {error}')
         return False
 
+    try:
+        _get_buffer().put_nowait((exchange, routing_key, body))
+        return True
+    except asyncio.QueueFull:
+        # Overload policy: drop newest rather than stall request handlers
+        _stats['dropped'] += 1
+        return False
+
+
+async def _publish_one(exchange: str, routing_key: str, body: bytes):
+    message = aio_pika.Message(body=body, delivery_mode=aio_pika.DeliveryMode.PERSISTENT)
+    await _exchanges[exchange].publish(message, routing_key=routing_key)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """A lost connection or a dead channel can heal on a fresh channel; nacks and bugs cannot"""
+    return isinstance(error, (AMQPConnectionError, ConnectionError, ChannelClosed, ChannelInvalidStateError))
+
+
+async def _publish_batch(batch: List[Tuple[str, str, bytes]], max_attempts: int):
+    """
+    Publish a batch concurrently and wait for all confirms. Connection and channel errors are
+    retried with backoff on a new channel, up to max_attempts; anything still unpublished then
+    counts as failed.
+    """
+    global _channel
+    pending = batch
+    backoff = 0.5
+    attempt = 0
+    while pending:
+        attempt += 1
+        try:
+            await get_channel()
+            results = await asyncio.gather(
+                *(_publish_one(*item) for item in pending),
+                return_exceptions=True
+            )
+        except Exception as error:
+            results = [error] * len(pending)
+
+        retry = []
+        last_error = None
+        for item, result in zip(pending, results):
+            if not isinstance(result, Exception):
+                _stats['published'] += 1
+            elif not _is_retryable(result):
+                # Nacked or a bug: retrying would not help
+                _stats['failed'] += 1
+                print(f'Failed to publish event: {result!r}')
+            else:
+                retry.append(item)
+                last_error = result
+
+        if retry and attempt >= max_attempts:
+            # Give up so the single publisher loop keeps draining the buffer
+            _stats['failed'] += len(retry)
+            print(f'Failed to publish {len(retry)} events after {attempt} attempts: {last_error}')
+            return
+        if retry:
+            # A channel in a bad state may still look open; make get_channel() build a new one
+            _channel = None
+            print(f'Failed to publish {len(retry)} events, retrying in {backoff}s: {last_error}')
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+        pending = retry
+
+
+async def _publisher_loop(batch_size: int, max_attempts: int):
+    buffer = _get_buffer()
+    while True:
+        batch = [await buffer.get()]
+        # Batching: take whatever else is already waiting, up to batch_size
+        while len(batch) < batch_size and not buffer.empty():
+            batch.append(buffer.get_nowait())
+        try:
+            await _publish_batch(batch, max_attempts)
+        except Exception as error:
+            # Never let one bad batch stop the publisher
+            _stats['failed'] += len(batch)
+            print(f'Failed to publish event batch: {error}')
+        finally:
+            for _ in batch:
+                buffer.task_done()
+
+
+def start_publisher():
+    """Start the background publisher on the running event loop"""
+    global _publisher_task
+    if _publisher_task is None or _publisher_task.done():
+        config = Config()
+        _publisher_task = asyncio.create_task(
+            _publisher_loop(config.get_event_publish_batch_size(), config.get_event_publish_max_attempts())
+        )
+
+
+def get_publisher_stats() -> Dict[str, int]:
+    buffered = _buffer.qsize() if _buffer is not None else 0
+    return {**_stats, 'buffered': buffered}
+
 
-def close_connection():
-    """Close RabbitMQ connection"""
-    global _channel, _connection
+async def close_connection(flush_timeout: float = 5.0):
+    """Flush buffered events, stop the publisher and close the RabbitMQ connection"""
+    global _channel, _connection, _publisher_task
+    if _publisher_task and not _publisher_task.done():
+        try:
+            await asyncio.wait_for(_get_buffer().join(), timeout=flush_timeout)
+        except asyncio.TimeoutError:
+            print(f'Closing with {_get_buffer().qsize()} unpublished events')
+        _publisher_task.cancel()
+        _publisher_task = None
     if _channel and not _channel.is_closed:
-        _channel.close()
+        await _channel.close()
         _channel = None
     if _connection and not _connection.is_closed:
-        _connection.close()
+        await _connection.close()
         _connection = None
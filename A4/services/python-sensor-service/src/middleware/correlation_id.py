@@ -1,18 +1,42 @@
 import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from contextvars import ContextVar
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+# Request-scoped: each request (asyncio task) sees its own value
+correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
+
+
+def get_correlation_id() -> Optional[str]:
+    return correlation_id_var.get()
+
+
+class CorrelationIdMiddleware:
+    """Pure ASGI: no extra task or response stream copy, the header is added on http.response.start"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
         # Get or generate correlation ID
-        correlation_id = request.headers.get('x-correlation-id') or \
+        correlation_id = Headers(scope=scope).get('x-correlation-id') or \
                         f'req-{uuid.uuid4().hex[:16]}'
-        
-        request.state.correlation_id = correlation_id
-        
-        response = await call_next(request)
-        response.headers['X-Correlation-ID'] = correlation_id
-        
-        return response
+
+        # request.state is backed by scope['state']
+        scope.setdefault('state', {})['correlation_id'] = correlation_id
+
+        async def send_with_correlation_id(message: Message):
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message)['X-Correlation-ID'] = correlation_id
+            await send(message)
+
+        token = correlation_id_var.set(correlation_id)
+        try:
+            await self.app(scope, receive, send_with_correlation_id)
+        finally:
+            correlation_id_var.reset(token)
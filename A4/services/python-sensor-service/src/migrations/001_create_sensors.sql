@@ -24,6 +24,7 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
--- Create trigger to auto-update updated_at
+-- Create trigger to auto-update updated_at (dropped first so startup migrations are re-runnable)
+DROP TRIGGER IF EXISTS update_sensors_updated_at ON sensors;
 CREATE TRIGGER update_sensors_updated_at BEFORE UPDATE ON sensors
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -0,0 +1,5 @@
+-- Composite index matching the (timestamp, sensor_id) keyset used by cursor pagination
+CREATE INDEX IF NOT EXISTS idx_sensors_timestamp_sensor_id ON sensors(timestamp, sensor_id);
+
+-- Composite index for type-filtered pages so the filter and the keyset share one index scan
+CREATE INDEX IF NOT EXISTS idx_sensors_type_timestamp_sensor_id ON sensors(type, timestamp, sensor_id);
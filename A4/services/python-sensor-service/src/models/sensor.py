@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import re
 
@@ -39,6 +39,11 @@ class SensorCreate(SensorBase):
     pass
 
 
+class SensorLookup(BaseModel):
+    """Schema for looking up many sensors by id"""
+    sensor_ids: List[str] = Field(..., description="Sensor ids to fetch")
+
+
 class Sensor(SensorBase):
     """Schema for sensor response"""
     timestamp: str = Field(..., description="ISO 8601 timestamp")
@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+
+
+class SensorCache:
+    """
+    In-process LRU cache of sensor rows with a per-entry TTL.
+    Only existing sensors are cached, so a sensor created by another worker
+    is never hidden behind a cached miss.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, sensor_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(sensor_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[sensor_id]
+            self._stats['misses'] += 1
+            return None
+
+        self._entries.move_to_end(sensor_id)
+        self._stats['hits'] += 1
+        # Copy so callers can never mutate the cached row
+        return dict(entry[1])
+
+    def set(self, sensor: Dict[str, Any]):
+        if self.max_entries <= 0:
+            return
+        sensor_id = sensor['sensor_id']
+        self._entries[sensor_id] = (time.monotonic() + self.ttl_seconds, dict(sensor))
+        self._entries.move_to_end(sensor_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def invalidate(self, sensor_id: str):
+        if self._entries.pop(sensor_id, None) is not None:
+            self._stats['invalidations'] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self._stats['hits'] + self._stats['misses']
+        return {
+            **self._stats,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hit_ratio': round(self._stats['hits'] / lookups, 4) if lookups else 0.0
+        }
+
+
+class CachedSensorRepository:
+    """Read-through/write-through cache in front of SensorRepository; other calls pass straight through"""
+
+    def __init__(self, repository, cache: SensorCache):
+        self._repository = repository
+        self._cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self._repository, name)
+
+    async def find_by_id(self, sensor_id: str) -> Optional[Dict[str, Any]]:
+        sensor = self._cache.get(sensor_id)
+        if sensor is not None:
+            return sensor
+
+        sensor = await self._repository.find_by_id(sensor_id)
+        if sensor is not None:
+            self._cache.set(sensor)
+        return sensor
+
+    async def find_by_ids(self, sensor_ids: List[str]) -> List[Dict[str, Any]]:
+        sensors = []
+        missing = []
+        for sensor_id in sensor_ids:
+            sensor = self._cache.get(sensor_id)
+            if sensor is not None:
+                sensors.append(sensor)
+            else:
+                missing.append(sensor_id)
+
+        # Only the ids the cache could not answer go to the database
+        if missing:
+            for sensor in await self._repository.find_by_ids(missing):
+                self._cache.set(sensor)
+                sensors.append(sensor)
+        return sensors
+
+    async def create(self, sensor_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        created = await self._repository.create(sensor_data)
+        if created is not None:
+            self._cache.set(created)
+        return created
+
+    async def create_many(self, sensors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        created = await self._repository.create_many(sensors)
+        for sensor in created:
+            self._cache.set(sensor)
+        return created
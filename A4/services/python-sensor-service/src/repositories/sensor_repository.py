@@ -1,75 +1,210 @@
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+from datetime import datetime, timezone
+import base64
+import json
+
+
+def encode_cursor(timestamp: datetime, sensor_id: str) -> str:
+    """Opaque keyset cursor for the (timestamp, sensor_id) sort key"""
+    raw = json.dumps([timestamp.isoformat(), sensor_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        timestamp, sensor_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(timestamp), str(sensor_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+SENSOR_COLUMNS = ['sensor_id', 'type', 'value', 'unit', 'timestamp']
+SENSOR_SELECT = ', '.join(SENSOR_COLUMNS)
+
+
+def _to_db_timestamp(timestamp):
+    """ISO 8601 string -> naive UTC datetime, as stored in the TIMESTAMP column"""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def _to_dict(row) -> Dict[str, Any]:
+    return {
+        'sensor_id': row['sensor_id'],
+        'type': row['type'],
+        'value': float(row['value']),
+        'unit': row['unit'],
+        'timestamp': row['timestamp'].isoformat() + 'Z'
+    }
 
 
 class SensorRepository:
     def __init__(self, pool):
         self._pool = pool
 
-    async def find_all(self) -> List[Dict[str, Any]]:
+    # Columns callers may sort by; anything else is rejected before it reaches SQL
+    ORDERABLE_COLUMNS = ('timestamp', 'sensor_id', 'type', 'value')
+
+    async def find_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        rows = await self._fetch(filters or {})
+        return [_to_dict(row) for row in rows]
+
+    async def find_page(self, filters: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Keyset pagination on (timestamp, sensor_id).
+        Fetches one extra row to know whether another page exists, so the cost
+        of a page depends only on its size, not on how deep it is.
+        """
+        limit = filters['limit']
+        rows = await self._fetch({**filters, 'limit': limit + 1})
+
+        next_cursor = None
+        keyset = (filters.get('order_by') or 'timestamp') == 'timestamp'
+        if len(rows) > limit and keyset:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last['timestamp'], last['sensor_id'])
+
+        return [_to_dict(row) for row in rows[:limit]], next_cursor
+
+    def stream_all(self, filters: Optional[Dict[str, Any]] = None, fetch_size: int = 500) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Same rows as find_all, read through a server-side cursor in batches of fetch_size.
+        Filters are validated here, before the first batch is requested, so bad input
+        still fails before any response is sent.
+        """
+        query, params = self._build_query(filters or {})
+        return self._stream(query, params, fetch_size)
+
+    async def _stream(self, query: str, params: List[Any], fetch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        async with self._pool.acquire() as conn:
+            # Server-side cursors only live inside a transaction
+            async with conn.transaction():
+                cursor = await conn.cursor(query, *params)
+                while True:
+                    rows = await cursor.fetch(fetch_size)
+                    if not rows:
+                        return
+                    yield [_to_dict(row) for row in rows]
+
+    async def _fetch(self, filters: Dict[str, Any]):
+        query, params = self._build_query(filters)
         async with self._pool.acquire() as conn:
-            rows = await conn.fetch('SELECT * FROM sensors ORDER BY timestamp DESC')
-            return [
-                {
-                    'sensor_id': row['sensor_id'],
-                    'type': row['type'],
-                    'value': float(row['value']),
-                    'unit': row['unit'],
-                    'timestamp': row['timestamp'].isoformat() + 'Z'
-                }
-                for row in rows
-            ]
+            return await conn.fetch(query, *params)
+
+    def _build_query(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        query = f'SELECT {SENSOR_SELECT} FROM sensors WHERE 1=1'
+        params = []
+        param_count = 1
+
+        if filters.get('type'):
+            query += f' AND type = ${param_count}'
+            params.append(filters['type'])
+            param_count += 1
+
+        order_by = filters.get('order_by') or 'timestamp'
+        if order_by not in self.ORDERABLE_COLUMNS:
+            raise ValueError(f"order_by must be one of: {', '.join(self.ORDERABLE_COLUMNS)}")
+        direction = 'ASC' if str(filters.get('order', 'desc')).lower() == 'asc' else 'DESC'
+
+        if filters.get('cursor'):
+            if order_by != 'timestamp':
+                raise ValueError('cursor pagination requires order_by=timestamp')
+            if filters.get('offset'):
+                raise ValueError('cursor and offset cannot be combined')
+            after_timestamp, after_id = decode_cursor(filters['cursor'])
+            # Row-value comparison lets Postgres seek idx_sensors_timestamp_sensor_id
+            comparator = '>' if direction == 'ASC' else '<'
+            query += f' AND (timestamp, sensor_id) {comparator} (${param_count}, ${param_count + 1})'
+            params.extend([after_timestamp, after_id])
+            param_count += 2
+
+        # sensor_id breaks ties so pages are stable across requests
+        query += f' ORDER BY {order_by} {direction}'
+        if order_by != 'sensor_id':
+            query += f', sensor_id {direction}'
+
+        if filters.get('limit'):
+            query += f' LIMIT ${param_count}'
+            params.append(filters['limit'])
+            param_count += 1
+            if filters.get('offset'):
+                query += f' OFFSET ${param_count}'
+                params.append(filters['offset'])
+                param_count += 1
+
+        return query, params
 
     async def find_by_id(self, sensor_id: str) -> Optional[Dict[str, Any]]:
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                'SELECT * FROM sensors WHERE sensor_id = $1',
+                f'SELECT {SENSOR_SELECT} FROM sensors WHERE sensor_id = $1',
                 sensor_id
             )
             
             if not row:
                 return None
             
-            return {
-                'sensor_id': row['sensor_id'],
-                'type': row['type'],
-                'value': float(row['value']),
-                'unit': row['unit'],
-                'timestamp': row['timestamp'].isoformat() + 'Z'
-            }
-
-    async def create(self, sensor_data: Dict[str, Any]) -> Dict[str, Any]:
+            return _to_dict(row)
+
+    async def find_by_ids(self, sensor_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch many sensors in one round-trip; ids that do not exist are simply absent"""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                f'SELECT {SENSOR_SELECT} FROM sensors WHERE sensor_id = ANY($1::varchar[])',
+                sensor_ids
+            )
+            return [_to_dict(row) for row in rows]
+
+    async def create(self, sensor_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Conflict-aware insert in a single round-trip.
+        Returns None when the sensor_id already exists (no row comes back).
+        """
         async with self._pool.acquire() as conn:
-            # Convert timestamp string to datetime if needed
-            timestamp = sensor_data['timestamp']
-            if isinstance(timestamp, str):
-                # Parse ISO format timestamp
-                if timestamp.endswith('Z'):
-                    timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                else:
-                    timestamp = datetime.fromisoformat(timestamp)
-                # Convert to UTC and make timezone-naive for PostgreSQL
-                if timestamp.tzinfo is not None:
-                    timestamp = timestamp.astimezone().replace(tzinfo=None)
-            
             row = await conn.fetchrow(
-                '''INSERT INTO sensors (sensor_id, type, value, unit, timestamp)
+                f'''INSERT INTO sensors ({SENSOR_SELECT})
                    VALUES ($1, $2, $3, $4, $5)
-                   RETURNING *''',
+                   ON CONFLICT (sensor_id) DO NOTHING
+                   RETURNING {SENSOR_SELECT}''',
                 sensor_data['sensor_id'],
                 sensor_data['type'],
                 sensor_data['value'],
                 sensor_data['unit'],
-                timestamp
+                _to_db_timestamp(sensor_data['timestamp'])
             )
             
-            return {
-                'sensor_id': row['sensor_id'],
-                'type': row['type'],
-                'value': float(row['value']),
-                'unit': row['unit'],
-                'timestamp': row['timestamp'].isoformat() + 'Z'
-            }
+            if not row:
+                return None
+            
+            return _to_dict(row)
+
+    async def create_many(self, sensors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bulk insert: COPY into a transaction-scoped staging table, then one
+        INSERT ... SELECT ... ON CONFLICT DO NOTHING. Only rows that were actually
+        inserted are returned, so callers can tell duplicates apart per item.
+        """
+        records = [
+            (s['sensor_id'], s['type'], s['value'], s['unit'], _to_db_timestamp(s['timestamp']))
+            for s in sensors
+        ]
+        if not records:
+            return []
+
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute('CREATE TEMP TABLE sensors_staging (LIKE sensors) ON COMMIT DROP')
+                await conn.copy_records_to_table('sensors_staging', records=records, columns=SENSOR_COLUMNS)
+                rows = await conn.fetch(
+                    f'''INSERT INTO sensors ({SENSOR_SELECT})
+                       SELECT {SENSOR_SELECT} FROM sensors_staging
+                       ON CONFLICT (sensor_id) DO NOTHING
+                       RETURNING {SENSOR_SELECT}'''
+                )
+            return [_to_dict(row) for row in rows]
 
     async def exists(self, sensor_id: str) -> bool:
         async with self._pool.acquire() as conn:
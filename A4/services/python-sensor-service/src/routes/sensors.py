@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends, Request
 from typing import Optional
-from dependencies import get_sensor_controller
+from dependencies import get_sensor_controller, get_config
+from config.config import Config
 from controllers.sensor_controller import SensorController
-from models.sensor import Sensor, SensorCreate
+from models.sensor import Sensor, SensorCreate, SensorLookup
 from middleware.auth import verify_api_key
 
 router = APIRouter(prefix="/sensors", tags=["sensors"])
@@ -14,10 +15,36 @@ async def get_all_sensors(
     type: Optional[str] = None,
     limit: Optional[int] = None,
     offset: int = 0,
-    controller: SensorController = Depends(get_sensor_controller)
+    order_by: str = 'timestamp',
+    order: str = 'desc',
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    controller: SensorController = Depends(get_sensor_controller),
+    config: Config = Depends(get_config)
+):
+    """
+    List all sensors with optional filtering, ordering and pagination.
+    Pass the returned next_cursor as cursor to fetch the following page.
+    With stream=true (or Accept: application/x-ndjson) rows are streamed from a database cursor.
+    """
+    if stream or 'application/x-ndjson' in request.headers.get('accept', ''):
+        filters = {'type': type, 'limit': limit, 'offset': offset, 'order_by': order_by, 'order': order, 'cursor': cursor}
+        return await controller.stream_sensors(request, filters, config.get_stream_fetch_size())
+    return await controller.get_all_sensors(request, type, limit, offset, order_by, order, cursor)
+
+
+@router.post("/lookup", response_model=dict)
+async def lookup_sensors(
+    request: Request,
+    lookup: SensorLookup,
+    controller: SensorController = Depends(get_sensor_controller),
+    config: Config = Depends(get_config)
 ):
-    """List all sensors with optional filtering and pagination"""
-    return await controller.get_all_sensors(request, type, limit, offset)
+    """
+    Get many sensors by ID in a single query.
+    Ids that do not exist are listed under missing.
+    """
+    return await controller.lookup_sensors(request, lookup.sensor_ids, config.get_max_lookup_size())
 
 
 @router.get("/{sensor_id}", response_model=Sensor)
@@ -40,3 +67,18 @@ async def create_sensor(
     """Create a new sensor reading (requires API key authentication)"""
     sensor_data = sensor.dict()
     return await controller.create_sensor(request, sensor_data)
+
+
+@router.post("/batch")
+async def create_sensors_batch(
+    request: Request,
+    controller: SensorController = Depends(get_sensor_controller),
+    config: Config = Depends(get_config),
+    _: str = Depends(verify_api_key)
+):
+    """
+    Create many sensor readings in one request (requires API key authentication).
+    Body is a JSON array, or NDJSON with Content-Type: application/x-ndjson.
+    Returns one result per reading: created, duplicate or invalid.
+    """
+    return await controller.create_sensors_batch(request, config.get_max_batch_size())
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 
 
@@ -12,18 +12,20 @@ class SensorService:
         filters = filters or {}
         self.logger.info('Fetching all sensors', {'filters': filters})
 
-        sensors = await self.repository.find_all()
+        # Filtering, ordering and pagination are pushed down to the database
+        return await self.repository.find_all(filters)
 
-        # Business rule: Filter by type
-        if 'type' in filters and filters['type']:
-            sensors = [s for s in sensors if s['type'] == filters['type']]
+    async def get_sensors_page(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        self.logger.info('Fetching sensor page', {'filters': filters})
 
-        # Business rule: Pagination
-        if 'limit' in filters and filters['limit']:
-            offset = filters.get('offset', 0)
-            sensors = sensors[offset:offset + filters['limit']]
+        sensors, next_cursor = await self.repository.find_page(filters)
+        return {'data': sensors, 'next_cursor': next_cursor}
 
-        return sensors
+    def stream_sensors(self, filters: Dict[str, Any], fetch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Batches of sensors straight from a database cursor; raises ValueError for bad filters"""
+        self.logger.info('Streaming sensors', {'filters': filters})
+
+        return self.repository.stream_all(filters, fetch_size)
 
     async def get_sensor_by_id(self, sensor_id: str) -> Dict[str, Any]:
         self.logger.info('Fetching sensor', {'sensor_id': sensor_id})
@@ -36,16 +38,22 @@ class SensorService:
 
         return sensor
 
+    async def get_sensors_by_ids(self, sensor_ids: List[str]) -> Dict[str, Any]:
+        self.logger.info('Looking up sensors', {'count': len(sensor_ids)})
+
+        # Deduplicate while keeping the caller's order
+        unique_ids = list(dict.fromkeys(sensor_ids))
+        found = {sensor['sensor_id']: sensor for sensor in await self.repository.find_by_ids(unique_ids)}
+
+        return {
+            'data': [found[sensor_id] for sensor_id in unique_ids if sensor_id in found],
+            'missing': [sensor_id for sensor_id in unique_ids if sensor_id not in found]
+        }
+
     async def create_sensor(self, sensor_data: Dict[str, Any]) -> Dict[str, Any]:
         sensor_id = sensor_data['sensor_id']
         self.logger.info('Creating sensor', {'sensor_id': sensor_id})
 
-        # Business rule: Check duplicates
-        exists = await self.repository.exists(sensor_id)
-        if exists:
-            self.logger.warn('Sensor already exists', {'sensor_id': sensor_id})
-            raise ValueError('Sensor already exists')
-
         # Business rule: Auto-timestamp
         if 'timestamp' not in sensor_data or not sensor_data['timestamp']:
             sensor_data['timestamp'] = datetime.utcnow().isoformat() + 'Z'
@@ -53,7 +61,11 @@ class SensorService:
         # Business rule: Validate ranges
         self._validate_sensor_value(sensor_data)
 
+        # Business rule: Check duplicates (the insert reports them, no separate lookup)
         created = await self.repository.create(sensor_data)
+        if not created:
+            self.logger.warn('Sensor already exists', {'sensor_id': sensor_id})
+            raise ValueError('Sensor already exists')
 
         # Publish event asynchronously (non-blocking)
         if self.event_publisher:
@@ -64,6 +76,62 @@ class SensorService:
 
         return created
 
+    async def create_sensors_batch(self, sensors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate the whole batch in one pass, persist the valid readings with a
+        single bulk write and return one result per input reading, in order.
+        """
+        self.logger.info('Creating sensor batch', {'size': len(sensors)})
+
+        results: List[Dict[str, Any]] = []
+        valid = []
+        seen = set()
+        now = datetime.utcnow().isoformat() + 'Z'
+
+        for sensor_data in sensors:
+            sensor_id = sensor_data['sensor_id']
+            result = {'sensor_id': sensor_id}
+            results.append(result)
+
+            # Business rule: Check duplicates (within the batch here, against the table on insert)
+            if sensor_id in seen:
+                result.update(status='duplicate', error='Sensor already exists')
+                continue
+
+            # Business rule: Auto-timestamp
+            if not sensor_data.get('timestamp'):
+                sensor_data['timestamp'] = now
+
+            # Business rule: Validate ranges
+            try:
+                self._validate_sensor_value(sensor_data)
+            except ValueError as e:
+                result.update(status='invalid', error=str(e))
+                continue
+
+            seen.add(sensor_id)
+            valid.append(sensor_data)
+
+        created = {sensor['sensor_id']: sensor for sensor in await self.repository.create_many(valid)}
+
+        for result in results:
+            if 'status' in result:
+                continue
+            if result['sensor_id'] in created:
+                result['status'] = 'created'
+            else:
+                result.update(status='duplicate', error='Sensor already exists')
+
+        if self.event_publisher:
+            for sensor in created.values():
+                try:
+                    await self.event_publisher.publish_sensor_created(sensor)
+                except Exception as e:
+                    self.logger.error('Failed to publish sensor.created event', {'error': str(e)})
+
+        self.logger.info('Sensor batch created', {'size': len(sensors), 'created': len(created)})
+        return results
+
     def _validate_sensor_value(self, sensor: Dict[str, Any]):
         sensor_type = sensor['type']
         value = sensor['value']